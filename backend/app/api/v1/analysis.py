@@ -2,19 +2,23 @@
 Analysis API Endpoints
 Direct analysis operations and utilities
 """
-import io
-from typing import Optional
+from functools import lru_cache
+from typing import TYPE_CHECKING, Optional
 from uuid import uuid4
 
-import numpy as np
-import pandas as pd
 from fastapi import APIRouter, File, Form, HTTPException, UploadFile
+from fastapi.concurrency import run_in_threadpool
 
 from ...schemas import StrokeType
-from ...core import AnalysisPipeline, SwimBITFilter, EnergyClassifier
+from ...core.io import ACC_COLUMNS, GYRO_COLUMNS, MissingColumnsError, load_sensor_csv
+
+if TYPE_CHECKING:
+    from ...core import SwimBITFilter, EnergyClassifier
 
 router = APIRouter()
 
+_ANALYZE_COLUMNS = frozenset(ACC_COLUMNS + GYRO_COLUMNS)
+
 
 @router.post("/quick-analyze")
 async def quick_analyze(
@@ -28,25 +32,19 @@ async def quick_analyze(
     Returns immediate results without background processing.
     """
     try:
-        content = await file.read()
-        df = pd.read_csv(io.BytesIO(content))
+        await file.seek(0)
         
-        # Validate columns
-        required_cols = ['ACC_0', 'ACC_1', 'ACC_2', 'GYRO_0', 'GYRO_1', 'GYRO_2']
-        missing = [col for col in required_cols if col not in df.columns]
-        if missing:
-            raise HTTPException(
-                status_code=400,
-                detail=f"Missing required columns: {missing}"
+        # Parse and validate columns
+        try:
+            timestamps, accel, gyro, _ = await run_in_threadpool(
+                load_sensor_csv, file.file, required=_ANALYZE_COLUMNS
             )
+        except MissingColumnsError as e:
+            raise HTTPException(status_code=400, detail=str(e))
         
-        # Extract data
-        timestamps = df['timestamp'].values if 'timestamp' in df.columns else np.arange(len(df))
-        accel = df[['ACC_0', 'ACC_1', 'ACC_2']].values.astype(float)
-        gyro = df[['GYRO_0', 'GYRO_1', 'GYRO_2']].values.astype(float)
-        
-        # Run analysis
-        pipeline = AnalysisPipeline(sampling_rate=30.0)
+        # Run analysis; the SciPy-backed pipeline is imported on first use
+        from ...core import get_pipeline
+        pipeline = get_pipeline(sampling_rate=30.0)
         result = pipeline.analyze_from_arrays(
             timestamps=timestamps,
             accel=accel,
@@ -90,10 +88,10 @@ async def classify_stroke(
     Useful for testing and debugging classification.
     """
     try:
-        content = await file.read()
-        df = pd.read_csv(io.BytesIO(content))
-        
-        accel = df[['ACC_0', 'ACC_1', 'ACC_2']].values.astype(float)
+        await file.seek(0)
+        _, accel, _, _ = await run_in_threadpool(
+            load_sensor_csv, file.file, required=ACC_COLUMNS
+        )
         
         # Slice data
         if end_idx is None:
@@ -101,7 +99,7 @@ async def classify_stroke(
         accel = accel[start_idx:end_idx]
         
         # Classify
-        classifier = EnergyClassifier()
+        classifier = _get_classifier()
         stroke_type = classifier.classify(accel)
         energy_profile = classifier.get_energy_profile(accel)
         
@@ -115,6 +113,20 @@ async def classify_stroke(
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@lru_cache(maxsize=1)
+def _get_classifier() -> "EnergyClassifier":
+    """Shared classifier using the configured thresholds"""
+    from ...core import EnergyClassifier
+    return EnergyClassifier()
+
+
+@lru_cache(maxsize=32)
+def _get_filter(order: int, cutoff_hz: float) -> "SwimBITFilter":
+    """Shared filter instance per (order, cutoff) combination"""
+    from ...core import SwimBITFilter
+    return SwimBITFilter(order=order, cutoff_hz=cutoff_hz)
+
+
 @router.post("/filter-signal")
 async def filter_signal(
     file: UploadFile = File(...),
@@ -127,13 +139,13 @@ async def filter_signal(
     Returns filtered data for visualization or testing.
     """
     try:
-        content = await file.read()
-        df = pd.read_csv(io.BytesIO(content))
-        
-        accel = df[['ACC_0', 'ACC_1', 'ACC_2']].values.astype(float)
+        await file.seek(0)
+        _, accel, _, _ = await run_in_threadpool(
+            load_sensor_csv, file.file, required=ACC_COLUMNS
+        )
         
         # Apply filter
-        filter = SwimBITFilter(order=order, cutoff_hz=cutoff_hz)
+        filter = _get_filter(order, cutoff_hz)
         filtered = filter.process(accel, sampling_rate=30.0)
         
         # Return summary statistics
@@ -2,32 +2,51 @@
 Sessions API Endpoints
 Handles session upload, status, and results retrieval
 """
-import io
+import asyncio
 from datetime import datetime
+from pathlib import Path
 from typing import Optional
 from uuid import UUID, uuid4
 
 import numpy as np
 import pandas as pd
-from fastapi import APIRouter, File, Form, HTTPException, UploadFile, BackgroundTasks
+from fastapi import APIRouter, File, Form, HTTPException, Response, UploadFile, BackgroundTasks
+from fastapi.concurrency import run_in_threadpool
 
 from ...schemas import (
     SessionUploadResponse,
     SessionStatusResponse,
     AnalysisResult as AnalysisResultSchema,
-    LapDetail,
     SessionSummary,
     SessionStatus,
     StrokeType,
 )
-from ...core import AnalysisPipeline
-from ...models import SessionData, SensorData, AnalysisResult
+from ...config import get_settings
+from ...core.io import (
+    ARROW_AVAILABLE,
+    SENSOR_CACHE_SUFFIX,
+    InvalidRawDataError,
+    MissingColumnsError,
+    laps_to_arrow_ipc,
+    load_sensor_csv,
+    load_sensor_raw,
+    write_sensor_cache,
+)
+from ...core.store import get_session_store
+from ...models import AnalysisResult
+from ...tasks import analyze_cached_session, get_executor
 
 router = APIRouter()
 
-# In-memory storage for demo (replace with database in production)
-_sessions: dict[UUID, dict] = {}
-_analysis_results: dict[UUID, AnalysisResult] = {}
+# Media type marking an upload as packed RAW_SENSOR_DTYPE records. Only
+# this explicit type selects the raw decoder: clients label files they
+# cannot identify (including CSVs) as application/octet-stream.
+RAW_CONTENT_TYPE = "application/x-aquametric-raw"
+
+
+def _cache_path(session_id: UUID) -> Path:
+    """Upload cache file of a session, present until its analysis finishes"""
+    return get_settings().session_cache_dir / f"{session_id}{SENSOR_CACHE_SUFFIX}"
 
 
 @router.post("/upload", response_model=SessionUploadResponse)
@@ -41,44 +60,48 @@ async def upload_session(
     """
     Upload sensor data for a swimming session
     
-    Accepts CSV or binary sensor data files.
+    Accepts CSV or binary sensor data files. Files are parsed as CSV
+    unless sent as application/x-aquametric-raw, which are decoded as
+    packed RAW_SENSOR_DTYPE records.
     Triggers async analysis processing.
     """
     session_id = uuid4()
     
     try:
-        # Read uploaded file
-        content = await file.read()
+        # Parse the uploaded file straight from its spooled temp file;
+        # raw binary uploads skip text parsing entirely
+        await file.seek(0)
+        loader = load_sensor_raw if file.content_type == RAW_CONTENT_TYPE else load_sensor_csv
+        try:
+            timestamps, accel, gyro, mag = await run_in_threadpool(loader, file.file)
+        except (MissingColumnsError, InvalidRawDataError) as e:
+            raise HTTPException(status_code=400, detail=str(e))
         
-        # Parse CSV data
-        df = pd.read_csv(io.BytesIO(content))
-        
-        # Validate required columns
-        required_cols = ['timestamp', 'ACC_0', 'ACC_1', 'ACC_2', 'GYRO_0', 'GYRO_1', 'GYRO_2']
-        missing = [col for col in required_cols if col not in df.columns]
-        if missing:
-            raise HTTPException(
-                status_code=400,
-                detail=f"Missing required columns: {missing}"
-            )
+        # Spill parsed data to disk; only metadata stays in memory.
+        # The file is removed once the background analysis has run.
+        cache_path = _cache_path(session_id)
+        write_sensor_cache(cache_path, timestamps, accel, gyro, mag)
         
         # Store session metadata
-        _sessions[session_id] = {
-            "id": session_id,
-            "status": SessionStatus.PROCESSING,
-            "pool_length_m": pool_length_m,
-            "device_type": device_type,
-            "notes": notes,
-            "uploaded_at": datetime.now(),
-            "data": df,
-            "progress": 0,
-        }
+        try:
+            await get_session_store().set_session(session_id, {
+                "id": session_id,
+                "status": SessionStatus.PROCESSING,
+                "pool_length_m": pool_length_m,
+                "device_type": device_type,
+                "notes": notes,
+                "uploaded_at": datetime.now(),
+                "progress": 0,
+            })
+        except Exception:
+            cache_path.unlink(missing_ok=True)
+            raise
         
         # Queue background analysis
         background_tasks.add_task(
             _process_session,
             session_id=session_id,
-            df=df,
+            cache_path=cache_path,
             pool_length_m=pool_length_m
         )
         
@@ -88,71 +111,50 @@ async def upload_session(
             message="Session uploaded successfully. Analysis in progress."
         )
         
+    except HTTPException:
+        raise
     except pd.errors.EmptyDataError:
         raise HTTPException(status_code=400, detail="Uploaded file is empty")
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 
-async def _process_session(session_id: UUID, df: pd.DataFrame, pool_length_m: int):
+async def _process_session(session_id: UUID, cache_path: Path, pool_length_m: int):
     """
     Background task to process uploaded session data
+    
+    The analysis itself runs in the worker process pool so it neither
+    blocks the event loop nor competes with request handling for the GIL.
     """
+    store = get_session_store()
     try:
         # Update progress
-        if session_id in _sessions:
-            _sessions[session_id]["progress"] = 10
-        
-        # Extract sensor data
-        timestamps = df['timestamp'].values.astype(float)
-        accel = df[['ACC_0', 'ACC_1', 'ACC_2']].values.astype(float)
-        gyro = df[['GYRO_0', 'GYRO_1', 'GYRO_2']].values.astype(float)
-        
-        # Check for magnetometer data
-        mag = None
-        if all(col in df.columns for col in ['MAG_0', 'MAG_1', 'MAG_2']):
-            mag = df[['MAG_0', 'MAG_1', 'MAG_2']].values.astype(float)
-        
-        # Create sensor data object
-        sensor_data = SensorData(
-            timestamps=timestamps,
-            accel=accel,
-            gyro=gyro,
-            mag=mag
-        )
+        await store.update_session(session_id, progress=10)
         
-        # Create session object
-        session = SessionData(
-            session_id=session_id,
-            user_id=uuid4(),  # Would come from auth in production
-            pool_length_m=pool_length_m,
-            start_time=datetime.now(),
-            sensor_data=sensor_data
+        # Run analysis pipeline in a worker process
+        loop = asyncio.get_running_loop()
+        result = await loop.run_in_executor(
+            get_executor(),
+            analyze_cached_session,
+            cache_path,
+            session_id,
+            pool_length_m
         )
         
-        if session_id in _sessions:
-            _sessions[session_id]["progress"] = 30
-        
-        # Run analysis pipeline
-        # Note: Data is 30Hz, configure pipeline accordingly
-        pipeline = AnalysisPipeline(sampling_rate=30.0)
-        result = pipeline.analyze(session)
-        
-        if session_id in _sessions:
-            _sessions[session_id]["progress"] = 90
+        await store.update_session(session_id, progress=90)
         
         # Store result
-        _analysis_results[session_id] = result
+        await store.set_result(session_id, result)
         
         # Update session status
-        if session_id in _sessions:
-            _sessions[session_id]["status"] = SessionStatus.COMPLETED
-            _sessions[session_id]["progress"] = 100
+        await store.update_session(session_id, status=SessionStatus.COMPLETED, progress=100)
             
     except Exception as e:
-        if session_id in _sessions:
-            _sessions[session_id]["status"] = SessionStatus.FAILED
-            _sessions[session_id]["error"] = str(e)
+        await store.update_session(session_id, status=SessionStatus.FAILED, error=str(e))
+    
+    finally:
+        # The sensor data is only needed for the analysis itself
+        cache_path.unlink(missing_ok=True)
 
 
 @router.get("/{session_id}/status", response_model=SessionStatusResponse)
@@ -160,11 +162,10 @@ async def get_session_status(session_id: UUID):
     """
     Get processing status for a session
     """
-    if session_id not in _sessions:
+    session = await get_session_store().get_session(session_id)
+    if session is None:
         raise HTTPException(status_code=404, detail="Session not found")
     
-    session = _sessions[session_id]
-    
     return SessionStatusResponse(
         session_id=session_id,
         status=session["status"],
@@ -173,16 +174,15 @@ async def get_session_status(session_id: UUID):
     )
 
 
-@router.get("/{session_id}/analysis", response_model=AnalysisResultSchema)
-async def get_analysis_result(session_id: UUID):
+async def _get_completed_result(session_id: UUID) -> AnalysisResult:
     """
-    Get complete analysis results for a session
+    Fetch the analysis result of a session, raising HTTP errors if unavailable
     """
-    if session_id not in _sessions:
+    store = get_session_store()
+    session = await store.get_session(session_id)
+    if session is None:
         raise HTTPException(status_code=404, detail="Session not found")
     
-    session = _sessions[session_id]
-    
     if session["status"] == SessionStatus.PROCESSING:
         raise HTTPException(
             status_code=202,
@@ -195,23 +195,33 @@ async def get_analysis_result(session_id: UUID):
             detail=f"Analysis failed: {session.get('error', 'Unknown error')}"
         )
     
-    if session_id not in _analysis_results:
+    result = await store.get_result(session_id)
+    if result is None:
         raise HTTPException(status_code=404, detail="Analysis result not found")
     
-    result = _analysis_results[session_id]
+    return result
+
+
+@router.get("/{session_id}/analysis", response_model=AnalysisResultSchema)
+async def get_analysis_result(session_id: UUID):
+    """
+    Get complete analysis results for a session
+    """
+    result = await _get_completed_result(session_id)
     
-    # Convert to response schema
+    # Convert to response schema. Plain dicts are validated as one list
+    # by the schema, which is cheaper than building a LapDetail per lap.
     laps = [
-        LapDetail(
-            lap_number=lap.lap_number,
-            stroke_type=lap.stroke_type,
-            duration_sec=lap.duration_sec,
-            stroke_count=lap.stroke_count,
-            swolf=lap.swolf,
-            pace_per_100m=lap.pace_per_100m,
-            start_time=lap.start_idx / 30.0,  # Convert to seconds
-            end_time=lap.end_idx / 30.0,
-        )
+        {
+            "lap_number": lap.lap_number,
+            "stroke_type": lap.stroke_type,
+            "duration_sec": lap.duration_sec,
+            "stroke_count": lap.stroke_count,
+            "swolf": lap.swolf,
+            "pace_per_100m": lap.pace_per_100m,
+            "start_time": lap.start_idx / 30.0,  # Convert to seconds
+            "end_time": lap.end_idx / 30.0,
+        }
         for lap in result.laps
     ]
     
@@ -248,16 +258,34 @@ async def get_analysis_result(session_id: UUID):
     )
 
 
+@router.get("/{session_id}/analysis/arrow")
+async def get_analysis_result_arrow(session_id: UUID):
+    """
+    Get per-lap analysis results as an Arrow IPC stream
+    
+    Binary alternative to the JSON endpoint for sessions with many laps.
+    """
+    if not ARROW_AVAILABLE:
+        raise HTTPException(status_code=501, detail="Arrow export requires pyarrow")
+    
+    result = await _get_completed_result(session_id)
+    
+    return Response(
+        content=laps_to_arrow_ipc(result.laps, sampling_rate=30.0),
+        media_type="application/vnd.apache.arrow.stream"
+    )
+
+
 @router.delete("/{session_id}")
 async def delete_session(session_id: UUID):
     """
     Delete a session and its analysis results
     """
-    if session_id not in _sessions:
+    session = await get_session_store().delete_session(session_id)
+    if session is None:
         raise HTTPException(status_code=404, detail="Session not found")
     
-    del _sessions[session_id]
-    if session_id in _analysis_results:
-        del _analysis_results[session_id]
+    # Removes the upload cache if the session is deleted mid-analysis
+    _cache_path(session_id).unlink(missing_ok=True)
     
     return {"message": "Session deleted successfully"}
@@ -2,10 +2,12 @@
 Users API Endpoints
 User profile and statistics
 """
-from datetime import datetime, timedelta
+from datetime import datetime
 from typing import List
 from uuid import UUID, uuid4
 
+import numpy as np
+import pandas as pd
 from fastapi import APIRouter, Query
 
 from ...schemas import DailyStat, CalendarStatsResponse
@@ -39,34 +41,41 @@ async def get_calendar_stats(
     Returns daily statistics for the specified date range.
     """
     # Parse dates
-    start = datetime.strptime(start_date, "%Y-%m-%d")
-    end = datetime.strptime(end_date, "%Y-%m-%d")
+    dates = pd.date_range(
+        datetime.strptime(start_date, "%Y-%m-%d"),
+        datetime.strptime(end_date, "%Y-%m-%d"),
+        freq="D"
+    )
+    n_days = len(dates)
     
     # Generate demo data (would come from database in production)
-    stats: List[DailyStat] = []
-    current = start
+    rng = np.random.default_rng(42)  # Reproducible demo data
+    
+    # Simulate swimming patterns (more likely on weekdays)
+    is_weekday = dates.weekday < 5
+    swim_mask = rng.random(n_days) < np.where(is_weekday, 0.6, 0.3)
     
-    import random
-    random.seed(42)  # Reproducible demo data
+    distances = rng.integers(500, 3001, n_days)
+    durations = (distances / rng.uniform(0.8, 1.5, n_days)).astype(int)  # Variable pace
+    session_counts = rng.integers(1, 3, n_days)
+    intensity = np.minimum(4, distances // 750)
     
-    while current <= end:
-        # Simulate swimming patterns (more likely on weekdays)
-        is_weekday = current.weekday() < 5
-        swim_probability = 0.6 if is_weekday else 0.3
-        
-        if random.random() < swim_probability:
-            distance = random.randint(500, 3000)
-            duration = int(distance / random.uniform(0.8, 1.5))  # Variable pace
-            
-            stats.append(DailyStat(
-                date=current.strftime("%Y-%m-%d"),
-                total_distance_m=distance,
-                total_duration_sec=duration,
-                session_count=random.randint(1, 2),
-                intensity_level=min(4, distance // 750)
-            ))
-        
-        current += timedelta(days=1)
+    stats: List[DailyStat] = [
+        DailyStat(
+            date=date,
+            total_distance_m=distance,
+            total_duration_sec=duration,
+            session_count=sessions,
+            intensity_level=level
+        )
+        for date, distance, duration, sessions, level in zip(
+            dates[swim_mask].strftime("%Y-%m-%d"),
+            distances[swim_mask].tolist(),
+            durations[swim_mask].tolist(),
+            session_counts[swim_mask].tolist(),
+            intensity[swim_mask].tolist()
+        )
+    ]
     
     return CalendarStatsResponse(
         user_id=uuid4(),
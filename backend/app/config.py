@@ -3,6 +3,7 @@ Application Configuration
 Loads settings from environment and YAML files
 """
 import os
+import tempfile
 from pathlib import Path
 from functools import lru_cache
 from typing import Optional
@@ -56,6 +57,16 @@ class Settings(BaseSettings):
     # API Settings
     cors_origins: list[str] = ["http://localhost:3000", "http://localhost:8080"]
     
+    # Directory for uploaded sensor data awaiting/under analysis
+    session_cache_dir: Path = Path(tempfile.gettempdir()) / "aquametric"
+    
+    # Analysis worker processes (None = one per CPU)
+    analysis_workers: Optional[int] = None
+    
+    # Session state backend ('memory' or 'redis') and expiry
+    session_store: str = "memory"
+    session_ttl_sec: int = 86400
+    
     class Config:
         env_file = ".env"
         env_nested_delimiter = "__"
@@ -1,6 +1,11 @@
 """
 SwimBIT Analysis Core - Package
+
+The implementations are imported on first access (PEP 562), so importing
+a light submodule such as core.io or core.store does not pull in SciPy.
 """
+from importlib import import_module
+
 from .interfaces import (
     IPreprocessor,
     ISegmenter, 
@@ -8,11 +13,17 @@ from .interfaces import (
     IStrokeCounter,
     IAnalysisPipeline
 )
-from .preprocessor import SwimBITFilter
-from .classifier import EnergyClassifier
-from .segmenter import PitchRollSegmenter
-from .stroke_counter import BasicStrokeCounter
-from .pipeline import AnalysisPipeline
+
+# Public name -> submodule providing it
+_LAZY_EXPORTS = {
+    "SwimBITFilter": ".preprocessor",
+    "ButterworthFilter": ".preprocessor",
+    "EnergyClassifier": ".classifier",
+    "PitchRollSegmenter": ".segmenter",
+    "BasicStrokeCounter": ".stroke_counter",
+    "AnalysisPipeline": ".pipeline",
+    "get_pipeline": ".pipeline",
+}
 
 __all__ = [
     # Interfaces
@@ -23,8 +34,23 @@ __all__ = [
     "IAnalysisPipeline",
     # Implementations
     "SwimBITFilter",
+    "ButterworthFilter",
     "EnergyClassifier",
     "PitchRollSegmenter",
     "BasicStrokeCounter",
     "AnalysisPipeline",
+    "get_pipeline",
 ]
+
+
+def __getattr__(name: str):
+    if name not in _LAZY_EXPORTS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(import_module(_LAZY_EXPORTS[name], __name__), name)
+    # Cache on the package so later lookups skip this hook
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
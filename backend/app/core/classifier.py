@@ -6,6 +6,7 @@ The classifier uses axis-specific energy calculations to distinguish
 between different swimming styles based on their unique motion patterns.
 """
 import numpy as np
+from functools import lru_cache
 from typing import Optional
 
 from .interfaces import IClassifier
@@ -13,6 +14,34 @@ from ..schemas import StrokeType
 from ..config import get_algorithm_config
 
 
+def _resolve_thresholds(thresholds: dict) -> tuple[float, float, float, float]:
+    """
+    Extract the classification thresholds used by EnergyClassifier
+    
+    Returns:
+        (backstroke_gravity_z, freestyle_y_energy_ratio,
+         butterfly_x_energy, breaststroke_energy_max)
+    """
+    return (
+        float(thresholds.get('backstroke_gravity_z', 5.0)),
+        float(thresholds.get('freestyle_y_energy_ratio', 1.2)),
+        float(thresholds.get('butterfly_x_energy', 15.0)),
+        float(thresholds.get('breaststroke_energy_max', 12.0)),
+    )
+
+
+# Integer codes used by the vectorized classify_batch()
+_STROKE_CODES = tuple(StrokeType)
+_STROKE_INDEX = {stroke: i for i, stroke in enumerate(_STROKE_CODES)}
+_UNKNOWN_CODE = _STROKE_INDEX[StrokeType.UNKNOWN]
+
+
+@lru_cache(maxsize=1)
+def _default_thresholds() -> tuple[float, float, float, float]:
+    """Thresholds from the algorithm config, resolved once per process"""
+    return _resolve_thresholds(get_algorithm_config().classifier_thresholds)
+
+
 class EnergyClassifier(IClassifier):
     """
     Energy-based stroke classifier following SwimBIT methodology
@@ -37,10 +66,20 @@ class EnergyClassifier(IClassifier):
             thresholds: Dict of classification thresholds, 
                        uses config defaults if not provided
         """
-        config_thresholds = get_algorithm_config().classifier_thresholds
-        self.thresholds = thresholds if thresholds is not None else config_thresholds
+        if thresholds is None:
+            self.thresholds = get_algorithm_config().classifier_thresholds
+            resolved = _default_thresholds()
+        else:
+            self.thresholds = thresholds
+            resolved = _resolve_thresholds(thresholds)
+        
+        # Resolved once so classify() avoids per-call dict lookups
+        (self._backstroke_gravity_z,
+         self._freestyle_y_ratio,
+         self._butterfly_x_energy,
+         self._breaststroke_energy_max) = resolved
     
-    def _calculate_energy(self, data: np.ndarray) -> np.ndarray:
+    def _calculate_energy(self, data: np.ndarray, means: Optional[np.ndarray] = None) -> np.ndarray:
         """
         Calculate energy for each axis using SwimBIT formula
         
@@ -51,19 +90,36 @@ class EnergyClassifier(IClassifier):
         
         Args:
             data: Sensor data, shape (N,) or (N, 3)
+            means: Precomputed per-axis means of data, if available
             
         Returns:
             Energy value(s)
         """
         if data.ndim == 1:
-            mean = np.mean(data)
+            mean = np.mean(data, dtype=np.float64) if means is None else means
             return np.sum(np.abs(data - mean)) / len(data)
         else:
-            means = np.mean(data, axis=0)
-            deviations = np.abs(data - means)
-            return np.sum(deviations, axis=0) / len(data)
+            # Take abs in place so only one (N, 3) temporary is allocated
+            if means is None:
+                means = np.mean(data, axis=0, dtype=np.float64)
+            deviations = data - means
+            np.abs(deviations, out=deviations)
+            return np.mean(deviations, axis=0)
     
-    def _detect_backstroke_by_gravity(self, accel_data: np.ndarray) -> bool:
+    def _energy_and_mean(self, data: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Calculate per-axis energies and means with one mean reduction
+        
+        Args:
+            data: Sensor data, shape (N, 3)
+            
+        Returns:
+            Tuple of (energies, means), each shape (3,)
+        """
+        means = np.mean(data, axis=0, dtype=np.float64)
+        return self._calculate_energy(data, means), means
+    
+    def _detect_backstroke_by_gravity(self, z_mean: float) -> bool:
         """
         Detect backstroke by gravity vector orientation
         
@@ -72,16 +128,14 @@ class EnergyClassifier(IClassifier):
         other strokes.
         
         Args:
-            accel_data: Accelerometer data, shape (N, 3)
+            z_mean: Mean Z-axis acceleration over the lap
             
         Returns:
             True if likely backstroke based on gravity
         """
         # Z-axis mean should be positive and significant when face-up
         # (assuming standard watch orientation)
-        z_mean = np.mean(accel_data[:, 2])
-        threshold = self.thresholds.get('backstroke_gravity_z', 5.0)
-        return z_mean > threshold
+        return z_mean > self._backstroke_gravity_z
     
     def classify(self, lap_data: np.ndarray) -> StrokeType:
         """
@@ -101,28 +155,103 @@ class EnergyClassifier(IClassifier):
         if len(lap_data) < 30:  # Too short for reliable classification
             return StrokeType.UNKNOWN
         
-        # Calculate energy for each axis
-        energies = self._calculate_energy(lap_data)
-        E_x, E_y, E_z = energies[0], energies[1], energies[2]
+        # Per-axis means are shared by the gravity check and the energies.
+        # Accumulated in float64 like classify_batch(), so float32 laps
+        # near a threshold are decided the same way by both paths.
+        means = np.mean(lap_data, axis=0, dtype=np.float64)
         
         # 1. Check for backstroke by gravity orientation
-        if self._detect_backstroke_by_gravity(lap_data):
+        if self._detect_backstroke_by_gravity(means[2]):
             return StrokeType.BACKSTROKE
         
+        # Calculate energy for each axis
+        energies = self._calculate_energy(lap_data, means)
+        return self._classify_energies(energies[0], energies[1], energies[2])
+    
+    def classify_batch(self, accel: np.ndarray, bounds) -> list[StrokeType]:
+        """
+        Classify all laps of a session in one vectorized pass
+        
+        Equivalent to calling classify() on each accel[start:end], but
+        lap means and energies come from np.add.reduceat over the
+        concatenated lap samples instead of per-lap reductions. Both
+        paths accumulate in float64.
+        
+        Args:
+            accel: Accelerometer data for the session, shape (N, 3)
+            bounds: (start_idx, end_idx) pairs, sequence or (L, 2) array
+            
+        Returns:
+            Detected stroke type per lap
+        """
+        bounds = np.asarray(bounds, dtype=np.int64).reshape(-1, 2)
+        codes = np.full(len(bounds), _UNKNOWN_CODE, dtype=np.int8)
+        
+        lengths = bounds[:, 1] - bounds[:, 0]
+        valid = lengths >= 30  # Too short for reliable classification
+        if not valid.any():
+            return [_STROKE_CODES[c] for c in codes]
+        starts = bounds[valid, 0]
+        lengths = lengths[valid]
+        
+        # Gather all lap samples back to back so each per-lap reduction
+        # becomes one np.add.reduceat per axis
+        offsets = np.zeros(len(lengths), dtype=np.int64)
+        np.cumsum(lengths[:-1], out=offsets[1:])
+        sample_idx = np.arange(lengths.sum()) + np.repeat(starts - offsets, lengths)
+        
+        means = np.empty((3, len(lengths)))
+        energies = np.empty((3, len(lengths)))
+        for axis in range(3):
+            samples = np.take(accel[:, axis], sample_idx)
+            means[axis] = np.add.reduceat(samples, offsets, dtype=np.float64) / lengths
+            deviations = samples - np.repeat(means[axis], lengths)
+            np.abs(deviations, out=deviations)
+            energies[axis] = np.add.reduceat(deviations, offsets, dtype=np.float64) / lengths
+        E_x, E_y, E_z = energies
+        
+        # Same decision tree as classify() / _classify_energies()
+        y_ratio = self._freestyle_y_ratio
+        freestyle = (E_y > E_x * y_ratio) & (E_y > E_z * y_ratio)
+        butterfly = (E_x > self._butterfly_x_energy) | (
+            (E_x >= self._breaststroke_energy_max) & (E_x + E_y + E_z > 35)
+        )
+        valid_codes = np.select(
+            [means[2] > self._backstroke_gravity_z,
+             freestyle,
+             (E_z >= E_y) & butterfly,
+             E_z >= E_y],
+            [_STROKE_INDEX[StrokeType.BACKSTROKE],
+             _STROKE_INDEX[StrokeType.FREESTYLE],
+             _STROKE_INDEX[StrokeType.BUTTERFLY],
+             _STROKE_INDEX[StrokeType.BREASTSTROKE]],
+            default=_STROKE_INDEX[StrokeType.FREESTYLE]
+        )
+        codes[valid] = valid_codes
+        
+        return [_STROKE_CODES[c] for c in codes]
+    
+    def _classify_energies(self, E_x: float, E_y: float, E_z: float) -> StrokeType:
+        """
+        Decide between the non-backstroke styles from axis energies
+        
+        Args:
+            E_x, E_y, E_z: Per-axis energies of the lap
+            
+        Returns:
+            Detected stroke type
+        """
         # 2. Check for freestyle - Y-axis (roll) dominant
-        y_ratio = self.thresholds.get('freestyle_y_energy_ratio', 1.2)
+        y_ratio = self._freestyle_y_ratio
         if E_y > E_x * y_ratio and E_y > E_z * y_ratio:
             return StrokeType.FREESTYLE
         
         # 3. Symmetric strokes - Z-axis energy is significant
         if E_z >= E_y:
-            butterfly_threshold = self.thresholds.get('butterfly_x_energy', 15.0)
-            breaststroke_max = self.thresholds.get('breaststroke_energy_max', 12.0)
-            
             # Butterfly has more aggressive forward motion (X-axis energy)
-            if E_x > butterfly_threshold:
+            if E_x > self._butterfly_x_energy:
                 return StrokeType.BUTTERFLY
-            elif E_x < breaststroke_max:
+            elif E_x < self._breaststroke_energy_max:
                 return StrokeType.BREASTSTROKE
             else:
                 # Borderline case - use total energy as tiebreaker
@@ -145,8 +274,7 @@ class EnergyClassifier(IClassifier):
         Returns:
             Dictionary with energy values and derived metrics
         """
-        energies = self._calculate_energy(lap_data)
-        means = np.mean(lap_data, axis=0)
+        energies, means = self._energy_and_mean(lap_data)
         
         return {
             'energy_x': float(energies[0]),
@@ -172,6 +300,7 @@ class NeuralClassifier(IClassifier):
     def __init__(self, model_path: Optional[str] = None):
         self.model_path = model_path
         self.model = None  # Would be loaded from file
+        self._fallback = EnergyClassifier()
     
     def classify(self, lap_data: np.ndarray) -> StrokeType:
         """
@@ -180,5 +309,4 @@ class NeuralClassifier(IClassifier):
         Not yet implemented - falls back to EnergyClassifier
         """
         # Fallback to energy-based classification
-        fallback = EnergyClassifier()
-        return fallback.classify(lap_data)
+        return self._fallback.classify(lap_data)
@@ -4,7 +4,7 @@ Abstract base classes defining the analysis pipeline components
 Following Strategy Pattern for extensibility
 """
 from abc import ABC, abstractmethod
-from typing import List, Tuple
+from typing import List, Sequence, Tuple
 
 import numpy as np
 
@@ -31,6 +31,40 @@ class IPreprocessor(ABC):
             Filtered data with same shape as input
         """
         pass
+    
+    def process_multi(self, arrays: Sequence[np.ndarray],
+                      sampling_rate: float) -> List[np.ndarray]:
+        """
+        Filter several (N, k) arrays of the same length in one pass
+        
+        The arrays are stacked column-wise into one column-major buffer,
+        filtered with a single process() call and split back into views.
+        
+        Args:
+            arrays: Sensor arrays sharing the sample axis, each (N, k)
+            sampling_rate: Sampling frequency in Hz
+            
+        Returns:
+            Filtered arrays in the same order and shapes as the input
+        """
+        widths = [a.shape[1] for a in arrays]
+        combined = np.empty((len(arrays[0]), sum(widths)),
+                            dtype=np.result_type(*arrays), order='F')
+        bounds = np.cumsum([0] + widths)
+        for a, start, stop in zip(arrays, bounds[:-1], bounds[1:]):
+            combined[:, start:stop] = a
+        
+        filtered = self._process_stacked(combined, sampling_rate)
+        return [filtered[:, start:stop] for start, stop in zip(bounds[:-1], bounds[1:])]
+    
+    def _process_stacked(self, combined: np.ndarray, sampling_rate: float) -> np.ndarray:
+        """
+        Filter the stacked buffer built by process_multi()
+        
+        The buffer is private to the call, so implementations may filter
+        it in place.
+        """
+        return self.process(combined, sampling_rate)
 
 
 class ISegmenter(ABC):
@@ -72,6 +106,23 @@ class IClassifier(ABC):
             Detected stroke type
         """
         pass
+    
+    def classify_batch(self, accel: np.ndarray,
+                       bounds: List[Tuple[int, int]]) -> List[StrokeType]:
+        """
+        Classify every lap of a session
+        
+        Implementations may override this with a vectorized version;
+        the default classifies lap by lap.
+        
+        Args:
+            accel: Sensor data for the whole session, shape (N, 3)
+            bounds: (start_idx, end_idx) of each lap
+            
+        Returns:
+            Detected stroke type per lap
+        """
+        return [self.classify(accel[start:end]) for start, end in bounds]
 
 
 class IStrokeCounter(ABC):
@@ -0,0 +1,411 @@
+"""
+Sensor Data I/O
+Parsing of uploaded SwimBIT-format CSV files and on-disk session caching
+
+The CSV columns are parsed straight into contiguous NumPy arrays.
+Uses the multithreaded pyarrow CSV parser and Feather files when pyarrow
+is installed, and falls back to pandas / NumPy .npz files otherwise.
+"""
+import io
+import json
+from pathlib import Path
+from typing import BinaryIO, Iterable, Optional, Union
+
+import numpy as np
+import pandas as pd
+
+try:
+    import pyarrow as pa
+    from pyarrow import csv as pacsv
+    from pyarrow import feather
+except ImportError:  # pragma: no cover - optional dependency
+    pa = None
+    pacsv = None
+    feather = None
+
+from ..models import SwimLap
+from ..schemas import StrokeType
+
+
+TIMESTAMP_COLUMN = 'timestamp'
+ACC_COLUMNS = ('ACC_0', 'ACC_1', 'ACC_2')
+GYRO_COLUMNS = ('GYRO_0', 'GYRO_1', 'GYRO_2')
+MAG_COLUMNS = ('MAG_0', 'MAG_1', 'MAG_2')
+
+REQUIRED_COLUMNS = frozenset((TIMESTAMP_COLUMN,) + ACC_COLUMNS + GYRO_COLUMNS)
+_ACC_COLUMN_SET = frozenset(ACC_COLUMNS)
+_GYRO_COLUMN_SET = frozenset(GYRO_COLUMNS)
+_MAG_COLUMN_SET = frozenset(MAG_COLUMNS)
+
+# Packed little-endian record of the raw binary upload format
+RAW_SENSOR_DTYPE = np.dtype([
+    ('t', '<u8'),  # Device timestamp in nanoseconds
+    ('ax', '<i2'), ('ay', '<i2'), ('az', '<i2'),
+    ('gx', '<i2'), ('gy', '<i2'), ('gz', '<i2'),
+])
+
+# Raw count to physical unit conversion (±16 g / ±2000 dps full scale)
+ACC_SCALE = 16 * 9.80665 / 32768   # m/s^2 per LSB
+GYRO_SCALE = 2000 / 32768          # deg/s per LSB
+
+# Whether Arrow-based parsing, caching and IPC export are available
+ARROW_AVAILABLE = pa is not None
+
+# File suffix used by write_sensor_cache() for the available backend
+SENSOR_CACHE_SUFFIX = '.feather' if ARROW_AVAILABLE else '.npz'
+
+# Numeric schema of the SwimBIT CSV format.
+# Declaring it up front lets the parser skip type inference.
+SENSOR_DTYPES = {
+    TIMESTAMP_COLUMN: np.float64,
+    **{col: np.float32 for col in ACC_COLUMNS + GYRO_COLUMNS + MAG_COLUMNS},
+}
+
+# Canonical column order, used to report missing columns deterministically
+_COLUMN_ORDER = {name: i for i, name in enumerate(SENSOR_DTYPES)}
+
+
+class MissingColumnsError(ValueError):
+    """Raised when an uploaded file lacks required sensor columns"""
+
+    def __init__(self, missing: list[str]):
+        self.missing = missing
+        super().__init__(f"Missing required columns: {missing}")
+
+    def __reduce__(self):
+        # Rebuild from the column list so the error survives being
+        # pickled back from a worker process
+        return type(self), (self.missing,)
+
+
+class InvalidRawDataError(ValueError):
+    """Raised when a raw binary upload is not a whole number of records"""
+
+    def __init__(self, size: int):
+        self.size = size
+        super().__init__(
+            f"Raw sensor data size {size} is not a multiple of the "
+            f"{RAW_SENSOR_DTYPE.itemsize}-byte record size"
+        )
+
+    def __reduce__(self):
+        return type(self), (self.size,)
+
+
+def _read_columns(source: BinaryIO) -> dict[str, np.ndarray]:
+    """
+    Parse a CSV stream into a mapping of column name to 1-D array
+
+    Only the known sensor columns are returned.
+    """
+    if pacsv is not None:
+        table = pacsv.read_csv(
+            source,
+            convert_options=pacsv.ConvertOptions(
+                column_types={col: pa.from_numpy_dtype(dtype)
+                              for col, dtype in SENSOR_DTYPES.items()}
+            )
+        )
+        return {
+            name: table.column(name).to_numpy()
+            for name in table.column_names
+            if name in SENSOR_DTYPES
+        }
+
+    df = pd.read_csv(source, dtype=SENSOR_DTYPES)
+    return {
+        name: df[name].to_numpy()
+        for name in df.columns
+        if name in SENSOR_DTYPES
+    }
+
+
+def _stack(columns: dict[str, np.ndarray], names: tuple) -> np.ndarray:
+    """
+    Stack per-axis columns into an (N, 3) float32 array
+
+    The result is column-major so each axis stays contiguous, matching
+    the SensorData layout.
+    """
+    return np.array([columns[name] for name in names], dtype=np.float32).T
+
+
+def load_sensor_csv(
+    source: Union[bytes, BinaryIO],
+    required: Iterable[str] = REQUIRED_COLUMNS
+) -> tuple[np.ndarray, np.ndarray, Optional[np.ndarray], Optional[np.ndarray]]:
+    """
+    Parse an uploaded sensor CSV directly into NumPy arrays
+
+    File objects (e.g. UploadFile.file) are parsed straight from the
+    stream, without first buffering the whole upload as bytes.
+
+    Args:
+        source: Raw CSV bytes or a seekable binary file object
+        required: Columns that must be present in the file
+                  (accelerometer columns are always required)
+
+    Returns:
+        (timestamps, accel, gyro, mag) where timestamps is float64 (N,)
+        and the sensor arrays are float32 (N, 3). gyro and mag are None
+        when their columns are absent. Missing timestamps are replaced
+        with sample indices.
+
+    Raises:
+        pd.errors.EmptyDataError: If the file contains no data
+        MissingColumnsError: If any required column is absent
+    """
+    if isinstance(source, (bytes, bytearray, memoryview)):
+        source = io.BytesIO(source)
+
+    start = source.tell()
+    if not source.read(1):
+        raise pd.errors.EmptyDataError("No columns to parse from file")
+    source.seek(start)
+
+    columns = _read_columns(source)
+
+    # Accelerometer columns are always needed
+    missing = _ACC_COLUMN_SET.union(required).difference(columns)
+    if missing:
+        raise MissingColumnsError(sorted(missing, key=_COLUMN_ORDER.get))
+
+    return _to_arrays(columns)
+
+
+def load_sensor_raw(
+    source: Union[bytes, BinaryIO],
+    acc_scale: float = ACC_SCALE,
+    gyro_scale: float = GYRO_SCALE
+) -> tuple[np.ndarray, np.ndarray, np.ndarray, None]:
+    """
+    Decode a raw binary upload of packed RAW_SENSOR_DTYPE records
+
+    The records are viewed in place with np.frombuffer; no text
+    parsing is involved.
+
+    Args:
+        source: Raw bytes or a binary file object
+        acc_scale: Accelerometer units per raw count
+        gyro_scale: Gyroscope units per raw count
+
+    Returns:
+        (timestamps, accel, gyro, None) in the layout of load_sensor_csv()
+
+    Raises:
+        pd.errors.EmptyDataError: If the upload contains no data
+        InvalidRawDataError: If the size is not a whole number of records
+    """
+    if not isinstance(source, (bytes, bytearray, memoryview)):
+        source = source.read()
+    if not len(source):
+        raise pd.errors.EmptyDataError("No records in raw sensor data")
+    if len(source) % RAW_SENSOR_DTYPE.itemsize:
+        raise InvalidRawDataError(len(source))
+
+    records = np.frombuffer(source, dtype=RAW_SENSOR_DTYPE)
+    timestamps = records['t'].astype(np.float64)
+    accel = _scale_records(records, ('ax', 'ay', 'az'), acc_scale)
+    gyro = _scale_records(records, ('gx', 'gy', 'gz'), gyro_scale)
+    return timestamps, accel, gyro, None
+
+
+def _scale_records(records: np.ndarray, names: tuple, scale: float) -> np.ndarray:
+    """Convert three int16 record fields into a column-major float32 (N, 3) array"""
+    out = np.empty((len(records), 3), dtype=np.float32, order='F')
+    for i, name in enumerate(names):
+        np.multiply(records[name], np.float32(scale), out=out[:, i])
+    return out
+
+
+def _to_arrays(
+    columns: dict[str, np.ndarray]
+) -> tuple[np.ndarray, np.ndarray, Optional[np.ndarray], Optional[np.ndarray]]:
+    """Assemble (timestamps, accel, gyro, mag) from per-column arrays"""
+    accel = _stack(columns, ACC_COLUMNS)
+
+    if TIMESTAMP_COLUMN in columns:
+        timestamps = columns[TIMESTAMP_COLUMN]
+    else:
+        timestamps = np.arange(len(accel), dtype=np.float64)
+
+    gyro = None
+    if _GYRO_COLUMN_SET.issubset(columns):
+        gyro = _stack(columns, GYRO_COLUMNS)
+
+    mag = None
+    if _MAG_COLUMN_SET.issubset(columns):
+        mag = _stack(columns, MAG_COLUMNS)
+
+    return timestamps, accel, gyro, mag
+
+
+def write_sensor_cache(
+    path: Path,
+    timestamps: np.ndarray,
+    accel: np.ndarray,
+    gyro: Optional[np.ndarray] = None,
+    mag: Optional[np.ndarray] = None
+) -> None:
+    """
+    Persist parsed sensor arrays to disk
+
+    Writes an lz4-compressed Feather file when pyarrow is installed,
+    otherwise an uncompressed .npz archive. Use SENSOR_CACHE_SUFFIX
+    for the file extension.
+
+    Args:
+        path: Destination file path
+        timestamps: Timestamps, shape (N,)
+        accel: Accelerometer data, shape (N, 3)
+        gyro: Gyroscope data, shape (N, 3)
+        mag: Magnetometer data, shape (N, 3)
+    """
+    columns = {TIMESTAMP_COLUMN: timestamps}
+    for names, data in ((ACC_COLUMNS, accel), (GYRO_COLUMNS, gyro), (MAG_COLUMNS, mag)):
+        if data is not None:
+            columns.update({name: data[:, i] for i, name in enumerate(names)})
+
+    path.parent.mkdir(parents=True, exist_ok=True)
+    if path.suffix == '.feather':
+        feather.write_feather(pa.table(columns), str(path), compression='lz4')
+    else:
+        np.savez(path, **columns)
+
+
+def read_sensor_cache(
+    path: Path
+) -> tuple[np.ndarray, np.ndarray, Optional[np.ndarray], Optional[np.ndarray]]:
+    """
+    Load sensor arrays written by write_sensor_cache()
+
+    Args:
+        path: Cache file path
+
+    Returns:
+        (timestamps, accel, gyro, mag) as returned by load_sensor_csv()
+    """
+    if path.suffix == '.feather':
+        table = feather.read_table(str(path))
+        columns = {name: table.column(name).to_numpy() for name in table.column_names}
+    else:
+        with np.load(path) as archive:
+            columns = {name: archive[name] for name in archive.files}
+    return _to_arrays(columns)
+
+
+def laps_to_arrow_ipc(laps: list, sampling_rate: float = 30.0) -> bytes:
+    """
+    Encode per-lap results as an Arrow IPC stream
+
+    Requires pyarrow (see ARROW_AVAILABLE).
+
+    Args:
+        laps: SwimLap objects of an analysis result
+        sampling_rate: Sampling rate used to convert indices to seconds
+
+    Returns:
+        Arrow IPC stream bytes with one row per lap
+    """
+    n = len(laps)
+    start_idx = np.fromiter((lap.start_idx for lap in laps), dtype=np.int64, count=n)
+    end_idx = np.fromiter((lap.end_idx for lap in laps), dtype=np.int64, count=n)
+    table = pa.table({
+        'lap_number': np.fromiter((lap.lap_number for lap in laps), dtype=np.int32, count=n),
+        'stroke_type': pa.array([lap.stroke_type.value for lap in laps], type=pa.string()),
+        'duration_sec': np.fromiter((lap.duration_sec for lap in laps), dtype=np.float64, count=n),
+        'stroke_count': np.fromiter((lap.stroke_count for lap in laps), dtype=np.int32, count=n),
+        'swolf': np.fromiter((lap.swolf for lap in laps), dtype=np.int32, count=n),
+        'pace_per_100m': np.fromiter((lap.pace_per_100m for lap in laps), dtype=np.float64, count=n),
+        'start_time': start_idx / sampling_rate,
+        'end_time': end_idx / sampling_rate,
+    })
+
+    sink = pa.BufferOutputStream()
+    with pa.ipc.new_stream(sink, table.schema) as writer:
+        writer.write_table(table)
+    return sink.getvalue().to_pybytes()
+
+
+# Stored SwimLap fields in encode_laps() order, with their Arrow/NumPy types
+_LAP_FIELDS = (
+    ('lap_number', np.int32),
+    ('start_idx', np.int64),
+    ('end_idx', np.int64),
+    ('stroke_type', str),
+    ('stroke_count', np.int32),
+    ('duration_sec', np.float64),
+    ('pool_length_m', np.int32),
+)
+
+# Encoding produced by encode_laps() with the available backend
+LAPS_ENCODING = 'arrow' if ARROW_AVAILABLE else 'json'
+
+
+def encode_laps(laps: list) -> bytes:
+    """
+    Serialize SwimLap objects for storage
+
+    Unlike laps_to_arrow_ipc(), which exports derived display fields,
+    this keeps exactly the SwimLap fields so decode_laps() can rebuild
+    the laps. Writes an Arrow IPC stream when pyarrow is installed and
+    a JSON array otherwise (see LAPS_ENCODING).
+
+    Args:
+        laps: SwimLap objects
+
+    Returns:
+        Encoded laps in the LAPS_ENCODING format
+    """
+    if not ARROW_AVAILABLE:
+        return json.dumps([
+            [getattr(lap, name) for name, _ in _LAP_FIELDS] for lap in laps
+        ]).encode()
+
+    n = len(laps)
+    columns = {}
+    for name, dtype in _LAP_FIELDS:
+        if dtype is str:
+            columns[name] = pa.array([getattr(lap, name).value for lap in laps], type=pa.string())
+        else:
+            columns[name] = np.fromiter((getattr(lap, name) for lap in laps), dtype=dtype, count=n)
+    table = pa.table(columns)
+
+    sink = pa.BufferOutputStream()
+    with pa.ipc.new_stream(sink, table.schema) as writer:
+        writer.write_table(table)
+    return sink.getvalue().to_pybytes()
+
+
+def decode_laps(payload: bytes, encoding: str = LAPS_ENCODING) -> list:
+    """
+    Rebuild SwimLap objects written by encode_laps()
+
+    Args:
+        payload: Encoded laps
+        encoding: 'arrow' or 'json', as LAPS_ENCODING was when encoding
+
+    Returns:
+        List of SwimLap
+    """
+    if encoding == 'json':
+        rows = json.loads(payload)
+    elif encoding == 'arrow':
+        columns = pa.ipc.open_stream(payload).read_all().to_pydict()
+        rows = zip(*(columns[name] for name, _ in _LAP_FIELDS))
+    else:
+        raise ValueError(f"Unknown lap encoding: {encoding}")
+
+    laps = []
+    for (lap_number, start_idx, end_idx, stroke_type,
+         stroke_count, duration_sec, pool_length_m) in rows:
+        laps.append(SwimLap(
+            lap_number=lap_number,
+            start_idx=start_idx,
+            end_idx=end_idx,
+            stroke_type=StrokeType(stroke_type),
+            stroke_count=stroke_count,
+            duration_sec=duration_sec,
+            pool_length_m=pool_length_m,
+        ))
+    return laps
@@ -10,16 +10,18 @@ The pipeline coordinates:
 5. Metric calculation (SWOLF, pace, etc.)
 """
 from datetime import datetime
+from functools import lru_cache
 from typing import Optional
 from uuid import UUID
 
 import numpy as np
 
 from .interfaces import IPreprocessor, ISegmenter, IClassifier, IStrokeCounter, IAnalysisPipeline
-from .preprocessor import SwimBITFilter
+from .preprocessor import create_preprocessor
 from .segmenter import PitchRollSegmenter
 from .classifier import EnergyClassifier
 from .stroke_counter import BasicStrokeCounter
+from .io import load_sensor_csv
 from ..models import SessionData, SensorData, SwimLap, AnalysisResult
 from ..schemas import StrokeType
 from ..config import get_algorithm_config
@@ -59,7 +61,7 @@ class AnalysisPipeline(IAnalysisPipeline):
         self.sampling_rate = sampling_rate
         
         # Use defaults if not provided (Dependency Injection)
-        self.preprocessor = preprocessor or SwimBITFilter()
+        self.preprocessor = preprocessor or create_preprocessor(sampling_rate)
         self.segmenter = segmenter or PitchRollSegmenter(
             sampling_rate=sampling_rate
         )
@@ -75,12 +77,9 @@ class AnalysisPipeline(IAnalysisPipeline):
         Returns:
             Tuple of (filtered_accel, filtered_gyro)
         """
-        filtered_accel = self.preprocessor.process(
-            sensor_data.accel, 
-            self.sampling_rate
-        )
-        filtered_gyro = self.preprocessor.process(
-            sensor_data.gyro,
+        # Both sensors share the filter, so filter all six axes at once
+        filtered_accel, filtered_gyro = self.preprocessor.process_multi(
+            (sensor_data.accel, sensor_data.gyro),
             self.sampling_rate
         )
         return filtered_accel, filtered_gyro
@@ -91,14 +90,12 @@ class AnalysisPipeline(IAnalysisPipeline):
         start_idx: int,
         end_idx: int,
         lap_accel: np.ndarray,
+        stroke_type: StrokeType,
         pool_length_m: int
     ) -> SwimLap:
         """
         Create a SwimLap object with all metrics calculated
         """
-        # Classify stroke type
-        stroke_type = self.classifier.classify(lap_accel)
-        
         # Count strokes
         stroke_count = self.stroke_counter.count_strokes(lap_accel, stroke_type)
         
@@ -138,7 +135,9 @@ class AnalysisPipeline(IAnalysisPipeline):
         # Step 1: Preprocess
         filtered_accel, filtered_gyro = self._preprocess(session.sensor_data)
         
-        # Create filtered sensor data for segmentation
+        # Create filtered sensor data for segmentation. SensorData keeps
+        # float32 column-major arrays by reference, so this wraps the
+        # filter output and the session's mag/pressure without copying.
         filtered_sensor_data = SensorData(
             timestamps=session.sensor_data.timestamps,
             accel=filtered_accel,
@@ -146,6 +145,10 @@ class AnalysisPipeline(IAnalysisPipeline):
             mag=session.sensor_data.mag,
             pressure=session.sensor_data.pressure
         )
+        # Only non-float32 filter output is converted here; use the
+        # stored arrays for all per-lap work below
+        filtered_accel = filtered_sensor_data.accel
+        filtered_gyro = filtered_sensor_data.gyro
         
         # Step 2: Segment into laps
         lap_segments = self.segmenter.segment(
@@ -153,9 +156,11 @@ class AnalysisPipeline(IAnalysisPipeline):
             self.sampling_rate
         )
         
-        # Step 3: Process each lap
+        # Step 3: Classify all laps at once, then process each lap
+        stroke_types = self.classifier.classify_batch(filtered_accel, lap_segments)
+        
         laps = []
-        for i, (start_idx, end_idx) in enumerate(lap_segments):
+        for i, ((start_idx, end_idx), stroke_type) in enumerate(zip(lap_segments, stroke_types)):
             lap_accel = filtered_accel[start_idx:end_idx]
             
             lap = self._create_lap(
@@ -163,6 +168,7 @@ class AnalysisPipeline(IAnalysisPipeline):
                 start_idx=start_idx,
                 end_idx=end_idx,
                 lap_accel=lap_accel,
+                stroke_type=stroke_type,
                 pool_length_m=session.pool_length_m
             )
             laps.append(lap)
@@ -177,7 +183,7 @@ class AnalysisPipeline(IAnalysisPipeline):
             filtered_gyro=filtered_gyro
         )
         
-        return result
+        return result.finalize()
     
     def analyze_from_arrays(
         self,
@@ -210,6 +216,23 @@ class AnalysisPipeline(IAnalysisPipeline):
         return self.analyze(session)
 
 
+@lru_cache(maxsize=4)
+def get_pipeline(sampling_rate: float = 30.0) -> AnalysisPipeline:
+    """
+    Shared default pipeline for a sampling rate
+    
+    The default components keep no per-call state, so one instance can
+    serve concurrent requests.
+    
+    Args:
+        sampling_rate: Data sampling rate in Hz
+        
+    Returns:
+        Pipeline with default components
+    """
+    return AnalysisPipeline(sampling_rate=sampling_rate)
+
+
 class BatchAnalysisPipeline:
     """
     Pipeline for analyzing multiple sessions or data files
@@ -229,16 +252,10 @@ class BatchAnalysisPipeline:
         
         Expected columns: timestamp, ACC_0, ACC_1, ACC_2, GYRO_0, GYRO_1, GYRO_2
         """
-        import pandas as pd
-        from uuid import uuid4
-        
-        # Read CSV
-        df = pd.read_csv(filepath)
-        
-        # Extract sensor data
-        timestamps = df['timestamp'].values
-        accel = df[['ACC_0', 'ACC_1', 'ACC_2']].values
-        gyro = df[['GYRO_0', 'GYRO_1', 'GYRO_2']].values
+        # Parse straight into float32 arrays (pyarrow CSV reader when
+        # installed), without building a DataFrame
+        with open(filepath, 'rb') as f:
+            timestamps, accel, gyro, _ = load_sensor_csv(f)
         
         return self.pipeline.analyze_from_arrays(
             timestamps=timestamps,
@@ -247,21 +264,41 @@ class BatchAnalysisPipeline:
             pool_length_m=pool_length_m
         )
     
-    def analyze_directory(self, directory: str, pool_length_m: int = 25) -> list[AnalysisResult]:
+    def analyze_directory(
+        self,
+        directory: str,
+        pool_length_m: int = 25,
+        max_workers: Optional[int] = None
+    ) -> list[AnalysisResult]:
         """
         Analyze all CSV files in a directory
+        
+        Files are independent, so they are analyzed in parallel in a
+        process pool. Results keep the directory listing order; files that
+        fail are reported and skipped.
+        
+        Args:
+            directory: Directory containing SwimBIT CSV files
+            pool_length_m: Pool length in meters
+            max_workers: Worker process count (default: CPU count)
         """
-        import os
+        from concurrent.futures import ProcessPoolExecutor
         from pathlib import Path
         
-        results = []
-        dir_path = Path(directory)
+        csv_files = sorted(Path(directory).glob("*.csv"))
+        if not csv_files:
+            return []
         
-        for csv_file in dir_path.glob("*.csv"):
-            try:
-                result = self.analyze_csv_file(str(csv_file), pool_length_m)
-                results.append(result)
-            except Exception as e:
-                print(f"Error processing {csv_file}: {e}")
+        results = []
+        with ProcessPoolExecutor(max_workers=max_workers) as executor:
+            futures = [
+                executor.submit(self.analyze_csv_file, str(csv_file), pool_length_m)
+                for csv_file in csv_files
+            ]
+            for csv_file, future in zip(csv_files, futures):
+                try:
+                    results.append(future.result())
+                except Exception as e:
+                    print(f"Error processing {csv_file}: {e}")
         
         return results
@@ -4,13 +4,104 @@ SwimBIT Preprocessor Implementation
 
 Based on SwimBIT paper specifications for optimal swimming signal processing
 """
+import threading
+from fractions import Fraction
+from functools import lru_cache
+from typing import Optional
+
 import numpy as np
-from scipy.signal import firwin, filtfilt
+from scipy.signal import butter, firwin, resample_poly, sosfiltfilt
 
 from .interfaces import IPreprocessor
 from ..config import get_algorithm_config
 
 
+@lru_cache(maxsize=32)
+def _design_hamming(order: int, cutoff_hz: float, sampling_rate: float) -> np.ndarray:
+    """
+    Design FIR low-pass coefficients with a Hamming window
+    
+    Memoized across filter instances; the returned array is shared and
+    therefore read-only.
+    
+    Args:
+        order: Filter order (numtaps = order + 1)
+        cutoff_hz: Cutoff frequency in Hz
+        sampling_rate: Sampling frequency in Hz
+        
+    Returns:
+        Filter tap coefficients
+    """
+    nyquist = 0.5 * sampling_rate
+    normalized_cutoff = cutoff_hz / nyquist
+    
+    # Ensure normalized cutoff is valid (0 < cutoff < 1)
+    normalized_cutoff = min(max(normalized_cutoff, 0.01), 0.99)
+    
+    # Design FIR filter with Hamming window
+    # numtaps = order + 1 for FIR filter
+    taps = firwin(
+        numtaps=order + 1,
+        cutoff=normalized_cutoff,
+        window='hamming'
+    )
+    taps.setflags(write=False)
+    return taps
+
+
+@lru_cache(maxsize=32)
+def _zero_phase_kernel(order: int, cutoff_hz: float, sampling_rate: float) -> np.ndarray:
+    """
+    Combined kernel of a forward plus backward pass of the FIR filter
+    
+    Filtering with the taps forward and then backward is a single
+    convolution with their autocorrelation (length 2 * order + 1).
+    """
+    taps = _design_hamming(order, cutoff_hz, sampling_rate)
+    kernel = np.convolve(taps, taps[::-1])
+    kernel.setflags(write=False)
+    return kernel
+
+
+# Per-thread float64 scratch buffers for the padded filter input,
+# keyed by trailing shape; grown in powers of two
+_scratch = threading.local()
+
+
+def _scratch_buffer(n: int, trailing_shape: tuple) -> np.ndarray:
+    """
+    Return a reusable (n, ...) column-major float64 buffer
+    
+    Buffers are private to the calling thread, so concurrent requests
+    never share one. The returned view is only valid until the next call.
+    """
+    buffers = getattr(_scratch, 'buffers', None)
+    if buffers is None:
+        buffers = _scratch.buffers = {}
+    
+    buffer = buffers.get(trailing_shape)
+    if buffer is None or len(buffer) < n:
+        capacity = 1 << (n - 1).bit_length()
+        buffer = np.empty((capacity,) + trailing_shape, dtype=np.float64, order='F')
+        buffers[trailing_shape] = buffer
+    return buffer[:n]
+
+
+def _odd_extend(data: np.ndarray, edge: int) -> np.ndarray:
+    """
+    Odd extension of data by edge samples at both ends along axis 0
+    
+    Same values as scipy.signal's odd_ext (as used by filtfilt), but
+    written in float64 into the thread's scratch buffer.
+    """
+    n = len(data)
+    ext = _scratch_buffer(n + 2 * edge, data.shape[1:])
+    ext[edge:edge + n] = data
+    np.subtract(2 * ext[edge], ext[2 * edge:edge:-1], out=ext[:edge])
+    np.subtract(2 * ext[edge + n - 1], ext[edge + n - 2:n - 2:-1], out=ext[edge + n:])
+    return ext
+
+
 class SwimBITFilter(IPreprocessor):
     """
     SwimBIT specification-compliant digital filter
@@ -22,73 +113,95 @@ class SwimBITFilter(IPreprocessor):
     - Frequencies above 3Hz are considered noise (water turbulence, sensor jitter)
     """
     
-    def __init__(self, order: int = None, cutoff_hz: float = None):
+    def __init__(self, order: int = None, cutoff_hz: float = None,
+                 sampling_rate: Optional[float] = None):
         """
         Initialize the filter with configurable parameters
         
         Args:
             order: Filter order (default: 48 from config)
             cutoff_hz: Cutoff frequency in Hz (default: 3.0 from config)
+            sampling_rate: Expected sampling rate in Hz; if given, the
+                           filter is designed now rather than on first use
         """
         config = get_algorithm_config().filter_config
         self.order = order if order is not None else config['order']
         self.cutoff_hz = cutoff_hz if cutoff_hz is not None else config['cutoff_hz']
-        self._filter_taps_cache = {}
+        
+        if sampling_rate is not None:
+            _zero_phase_kernel(self.order, self.cutoff_hz, sampling_rate)
     
     def _get_filter_taps(self, sampling_rate: float) -> np.ndarray:
         """
-        Design and cache FIR filter coefficients
+        Get (cached) FIR filter coefficients
         
         Args:
             sampling_rate: Sampling frequency in Hz
             
         Returns:
-            Filter tap coefficients
+            Filter tap coefficients (read-only)
         """
-        if sampling_rate not in self._filter_taps_cache:
-            nyquist = 0.5 * sampling_rate
-            normalized_cutoff = self.cutoff_hz / nyquist
-            
-            # Ensure normalized cutoff is valid (0 < cutoff < 1)
-            normalized_cutoff = min(max(normalized_cutoff, 0.01), 0.99)
-            
-            # Design FIR filter with Hamming window
-            # numtaps = order + 1 for FIR filter
-            taps = firwin(
-                numtaps=self.order + 1,
-                cutoff=normalized_cutoff,
-                window='hamming'
-            )
-            self._filter_taps_cache[sampling_rate] = taps
-            
-        return self._filter_taps_cache[sampling_rate]
+        return _design_hamming(self.order, self.cutoff_hz, sampling_rate)
     
-    def process(self, data: np.ndarray, sampling_rate: float = 100.0) -> np.ndarray:
+    def process(self, data: np.ndarray, sampling_rate: float = 100.0,
+                out: Optional[np.ndarray] = None) -> np.ndarray:
         """
         Apply low-pass filter to sensor data
         
-        Uses zero-phase filtering (filtfilt) to avoid phase distortion,
+        Uses zero-phase filtering to avoid phase distortion,
         which is critical for accurate turn detection timing.
         
+        Equivalent to scipy.signal.filtfilt with its default odd padding:
+        the forward and backward passes are fused into one direct
+        convolution with the taps' autocorrelation. Only order samples
+        of odd extension reach the kept output, so that is all that is
+        padded.
+        
         Args:
             data: Raw sensor data, shape (N,) for single axis or (N, 3) for xyz
             sampling_rate: Sampling frequency in Hz
+            out: Optional array of the same shape to write the result to;
+                 may be data itself, filtering in place
             
         Returns:
-            Filtered data with same shape as input
+            Filtered data with same shape and floating dtype as input
+            (out, if given)
         """
         if len(data) <= self.order + 1:
             # Data too short for filtering, return as-is
-            return data
+            if out is None:
+                return data
+            out[...] = data
+            return out
             
-        taps = self._get_filter_taps(sampling_rate)
+        kernel = _zero_phase_kernel(self.order, self.cutoff_hz, sampling_rate)
+        edge = self.order
+        
+        # Computed in float64; float32 input is handed back as float32
+        dtype = data.dtype if np.issubdtype(data.dtype, np.floating) else np.float64
+        ext = _odd_extend(data, edge)
         
         # Handle both 1D and 2D arrays
         if data.ndim == 1:
-            return filtfilt(taps, 1.0, data)
-        else:
-            # Apply filter to each axis independently
-            return filtfilt(taps, 1.0, data, axis=0)
+            filtered = np.convolve(ext, kernel, mode='valid')
+            if out is None:
+                return filtered.astype(dtype, copy=False)
+            out[...] = filtered
+            return out
+        
+        # Apply filter to each axis independently. The input now lives in
+        # the scratch buffer, so out may alias data.
+        filtered = out if out is not None else np.empty(data.shape, dtype=dtype, order='F')
+        for axis in range(data.shape[1]):
+            filtered[:, axis] = np.convolve(ext[:, axis], kernel, mode='valid')
+        return filtered
+    
+    def _process_stacked(self, combined: np.ndarray, sampling_rate: float) -> np.ndarray:
+        """Filter process_multi()'s stacked buffer in place"""
+        if not np.issubdtype(combined.dtype, np.floating):
+            # Integer input is filtered into a new float64 array
+            return self.process(combined, sampling_rate)
+        return self.process(combined, sampling_rate, out=combined)
     
     def process_sensor_data(self, accel: np.ndarray, gyro: np.ndarray, 
                            sampling_rate: float = 100.0) -> tuple[np.ndarray, np.ndarray]:
@@ -103,10 +216,106 @@ class SwimBITFilter(IPreprocessor):
         Returns:
             Tuple of (filtered_accel, filtered_gyro)
         """
-        return (
-            self.process(accel, sampling_rate),
-            self.process(gyro, sampling_rate)
-        )
+        filtered_accel, filtered_gyro = self.process_multi((accel, gyro), sampling_rate)
+        return filtered_accel, filtered_gyro
+
+
+@lru_cache(maxsize=32)
+def _design_butterworth(order: int, cutoff_hz: float, sampling_rate: float) -> np.ndarray:
+    """
+    Design Butterworth low-pass coefficients in second-order sections
+    
+    Args:
+        order: IIR filter order
+        cutoff_hz: Cutoff frequency in Hz
+        sampling_rate: Sampling frequency in Hz
+        
+    Returns:
+        SOS coefficient array, shape (n_sections, 6)
+    """
+    normalized_cutoff = min(max(cutoff_hz / (0.5 * sampling_rate), 0.01), 0.99)
+    # Not marked read-only: sosfilt needs a writable coefficient buffer
+    return butter(order, normalized_cutoff, output='sos')
+
+
+class ButterworthFilter(IPreprocessor):
+    """
+    Low-order IIR alternative to the SwimBIT FIR filter
+    
+    Zero-phase Butterworth low-pass (sosfiltfilt). Not part of the SwimBIT
+    specification; select it with filter.type = "butterworth" in the
+    algorithm config.
+    """
+    
+    def __init__(self, order: int = None, cutoff_hz: float = None,
+                 sampling_rate: Optional[float] = None):
+        """
+        Initialize the filter with configurable parameters
+        
+        Args:
+            order: IIR filter order (default: filter.iir_order from config, or 4)
+            cutoff_hz: Cutoff frequency in Hz (default: 3.0 from config)
+            sampling_rate: Expected sampling rate in Hz; if given, the
+                           filter is designed now rather than on first use
+        """
+        config = get_algorithm_config().filter_config
+        self.order = order if order is not None else config.get('iir_order', 4)
+        self.cutoff_hz = cutoff_hz if cutoff_hz is not None else config['cutoff_hz']
+        
+        if sampling_rate is not None:
+            _design_butterworth(self.order, self.cutoff_hz, sampling_rate)
+    
+    def process(self, data: np.ndarray, sampling_rate: float = 100.0) -> np.ndarray:
+        """
+        Apply zero-phase low-pass filter to sensor data
+        
+        Args:
+            data: Raw sensor data, shape (N,) for single axis or (N, 3) for xyz
+            sampling_rate: Sampling frequency in Hz
+            
+        Returns:
+            Filtered data with same shape and floating dtype as input
+        """
+        sos = _design_butterworth(self.order, self.cutoff_hz, sampling_rate)
+        
+        # sosfiltfilt's default edge padding length
+        if len(data) <= 3 * (2 * len(sos) + 1):
+            # Data too short for filtering, return as-is
+            return data
+        
+        filtered = sosfiltfilt(sos, data, axis=0)
+        if np.issubdtype(data.dtype, np.floating):
+            return filtered.astype(data.dtype, copy=False)
+        return filtered
+
+
+def create_preprocessor(sampling_rate: Optional[float] = None) -> IPreprocessor:
+    """
+    Build the low-pass filter selected by filter.type in the algorithm config
+    
+    Args:
+        sampling_rate: Expected sampling rate in Hz (designs the filter eagerly)
+        
+    Returns:
+        SwimBITFilter for "fir" (default), ButterworthFilter for "butterworth"
+    """
+    filter_type = get_algorithm_config().filter_config.get('type', 'fir')
+    if filter_type == 'fir':
+        return SwimBITFilter(sampling_rate=sampling_rate)
+    if filter_type == 'butterworth':
+        return ButterworthFilter(sampling_rate=sampling_rate)
+    raise ValueError(f"Unknown filter type: {filter_type}")
+
+
+def _rational_approx(target_rate: float, sampling_rate: float, max_denominator: int = 1000) -> tuple[int, int]:
+    """
+    Approximate target_rate / sampling_rate as an up/down integer ratio
+    
+    Returns:
+        (up, down) factors for resample_poly
+    """
+    ratio = Fraction(target_rate / sampling_rate).limit_denominator(max_denominator)
+    return ratio.numerator, ratio.denominator
 
 
 class ResamplingPreprocessor(IPreprocessor):
@@ -129,19 +338,10 @@ class ResamplingPreprocessor(IPreprocessor):
             # Already at target rate, just filter
             return self.filter.process(data, sampling_rate)
         
-        # Resample using linear interpolation
-        n_samples = len(data)
-        duration = n_samples / sampling_rate
-        n_target = int(duration * self.target_rate)
-        
-        old_times = np.linspace(0, duration, n_samples)
-        new_times = np.linspace(0, duration, n_target)
-        
-        if data.ndim == 1:
-            resampled = np.interp(new_times, old_times, data)
-        else:
-            resampled = np.zeros((n_target, data.shape[1]))
-            for i in range(data.shape[1]):
-                resampled[:, i] = np.interp(new_times, old_times, data[:, i])
+        # Polyphase resampling of all axes in one call; unlike linear
+        # interpolation this also band-limits the signal (anti-aliasing)
+        up, down = _rational_approx(self.target_rate, sampling_rate)
+        n_target = int(len(data) / sampling_rate * self.target_rate)
+        resampled = resample_poly(data, up, down, axis=0)[:n_target]
         
         return self.filter.process(resampled, self.target_rate)
@@ -15,6 +15,76 @@ from ..models import SensorData
 from ..config import get_algorithm_config
 
 
+def _mask_runs(mask: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Start and (exclusive) end indices of the contiguous True runs in a mask
+    
+    Returns:
+        (starts, ends) int64 arrays, one entry per run
+    """
+    # Rising/falling edges of the zero-padded mask; the padding also
+    # closes a run still open at the end of the data
+    padded = np.zeros(len(mask) + 2, dtype=np.int8)
+    padded[1:-1] = np.asarray(mask, dtype=bool)
+    edges = np.diff(padded)
+    return np.flatnonzero(edges == 1), np.flatnonzero(edges == -1)
+
+
+def _mask_to_segments(mask: np.ndarray) -> List[Tuple[int, int]]:
+    """
+    Find start and end indices of contiguous True runs in a mask
+    
+    Args:
+        mask: Binary mask, shape (N,)
+        
+    Returns:
+        List of (start, end) index tuples, end exclusive
+    """
+    starts, ends = _mask_runs(mask)
+    return list(zip(starts.tolist(), ends.tolist()))
+
+
+# Binary morphology evaluated on run boundaries rather than per sample.
+# In 1-D, closing/opening with a centered window of 2 * size + 1 (samples
+# beyond the ends ignored) reduces to merging or dropping whole runs, so
+# the cost scales with the number of runs instead of N * passes.
+
+def _close_runs(starts: np.ndarray, ends: np.ndarray, n: int,
+                size: int) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Morphological closing expressed on True runs
+    
+    Fills gaps of up to 2 * size samples between runs, and gaps of up to
+    size samples between a run and either end of the data.
+    """
+    if len(starts) == 0:
+        return starts, ends
+    keep = (starts[1:] - ends[:-1]) > 2 * size
+    starts = starts[np.concatenate(([True], keep))]
+    ends = ends[np.concatenate((keep, [True]))]
+    if starts[0] <= size:
+        starts[0] = 0
+    if n - ends[-1] <= size:
+        ends[-1] = n
+    return starts, ends
+
+
+def _open_runs(starts: np.ndarray, ends: np.ndarray, n: int,
+               size: int) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Morphological opening expressed on True runs
+    
+    Drops runs of up to 2 * size samples, or up to size samples for runs
+    touching one end of the data. A run spanning all of it is kept.
+    """
+    at_start = starts == 0
+    at_end = ends == n
+    min_length = np.where(at_start | at_end, size, 2 * size)
+    min_length[at_start & at_end] = -1
+    keep = (ends - starts) > min_length
+    return starts[keep], ends[keep]
+
+
 class PitchRollSegmenter(ISegmenter):
     """
     Lap segmentation using acceleration pattern analysis
@@ -38,123 +108,38 @@ class PitchRollSegmenter(ISegmenter):
         self.pool_length_m = pool_length_m
         self.sampling_rate = sampling_rate
         self.config = get_algorithm_config().segmentation_config
+        
+        # Snapshot config values used on every call
+        self.min_lap_sec = self.config.get('min_lap_duration_sec', 10)
     
-    def _calculate_null_probability(self, accel: np.ndarray) -> np.ndarray:
+    def _calculate_null_probability(self, accel_magnitude: np.ndarray) -> np.ndarray:
         """
         Calculate probability that each sample is "null" (not swimming)
         
         Uses acceleration magnitude - lower values indicate rest/turn.
         
         Args:
-            accel: Accelerometer data, shape (N, 3)
+            accel_magnitude: Acceleration magnitude, shape (N,)
             
         Returns:
             Null probability for each sample, shape (N,)
         """
-        # Calculate acceleration magnitude (excluding gravity)
+        # Deviation of the acceleration magnitude from gravity
         # Assuming gravity is approximately 9.8 m/s²
+        # The shared magnitude is left untouched; the remaining steps are
+        # evaluated in place on this one buffer
         gravity = 9.8
-        magnitude = np.sqrt(np.sum(accel ** 2, axis=1))
+        magnitude = np.subtract(accel_magnitude, gravity)
         
         # Normalize: lower magnitude = higher null probability
         # When swimming, magnitude varies significantly; at rest, it's ~gravity
-        deviation = np.abs(magnitude - gravity)
+        deviation = np.abs(magnitude, out=magnitude)
         
         # Convert to probability (sigmoid-like transformation)
         # High deviation = low null probability (active swimming)
-        null_prob = 1.0 / (1.0 + deviation / 2.0)
-        
-        return null_prob
-    
-    def _morphological_close(self, mask: np.ndarray, size: int) -> np.ndarray:
-        """
-        Apply morphological closing to fill small gaps
-        
-        Args:
-            mask: Binary mask array
-            size: Structuring element size
-            
-        Returns:
-            Closed mask
-        """
-        result = mask.copy()
-        # Dilation followed by erosion
-        for i in range(len(mask)):
-            if any(mask[max(0, i - size):min(len(mask), i + size + 1)]):
-                result[i] = 1
-        
-        closed = result.copy()
-        for i in range(len(result)):
-            if not all(result[max(0, i - size):min(len(result), i + size + 1)]):
-                closed[i] = 0
-                
-        return closed
-    
-    def _morphological_open(self, mask: np.ndarray, size: int) -> np.ndarray:
-        """
-        Apply morphological opening to remove small objects
-        
-        Args:
-            mask: Binary mask array
-            size: Structuring element size
-            
-        Returns:
-            Opened mask
-        """
-        result = mask.copy()
-        # Erosion followed by dilation
-        for i in range(len(mask)):
-            if not all(mask[max(0, i - size):min(len(mask), i + size + 1)]):
-                result[i] = 0
-        
-        opened = result.copy()
-        for i in range(len(result)):
-            if any(result[max(0, i - size):min(len(result), i + size + 1)]):
-                opened[i] = 1
-                
-        return opened
-    
-    def _find_segments(self, mask: np.ndarray) -> List[Tuple[int, int]]:
-        """
-        Find start and end indices of contiguous True segments
-        
-        Args:
-            mask: Binary mask where True indicates swimming
-            
-        Returns:
-            List of (start, end) index tuples
-        """
-        segments = []
-        in_segment = False
-        start_idx = 0
-        
-        for i, is_active in enumerate(mask):
-            if is_active and not in_segment:
-                start_idx = i
-                in_segment = True
-            elif not is_active and in_segment:
-                segments.append((start_idx, i))
-                in_segment = False
-        
-        # Handle case where data ends while swimming
-        if in_segment:
-            segments.append((start_idx, len(mask)))
-        
-        return segments
-    
-    def _filter_short_segments(self, segments: List[Tuple[int, int]], 
-                               min_samples: int) -> List[Tuple[int, int]]:
-        """
-        Remove segments that are too short to be valid laps
-        
-        Args:
-            segments: List of (start, end) tuples
-            min_samples: Minimum number of samples for valid lap
-            
-        Returns:
-            Filtered list of segments
-        """
-        return [(s, e) for s, e in segments if (e - s) >= min_samples]
+        deviation /= 2.0
+        deviation += 1.0
+        return np.reciprocal(deviation, out=deviation)
     
     def segment(self, sensor_data: SensorData, sampling_rate: float = None) -> List[Tuple[int, int]]:
         """
@@ -171,10 +156,13 @@ class PitchRollSegmenter(ISegmenter):
             sampling_rate = self.sampling_rate
             
         # Calculate null probability
-        null_prob = self._calculate_null_probability(sensor_data.accel)
+        null_prob = self._calculate_null_probability(sensor_data.accel_magnitude)
         
-        # Threshold to get binary mask (swimming vs not swimming)
+        # Threshold to get binary mask (swimming vs not swimming),
+        # then work on its runs of swimming samples
         swimming_mask = null_prob < 0.5
+        n_samples = len(swimming_mask)
+        starts, ends = _mask_runs(swimming_mask)
         
         # Calculate morphological operation sizes based on sampling rate
         # Close small gaps (up to 3 seconds)
@@ -183,18 +171,14 @@ class PitchRollSegmenter(ISegmenter):
         open_size = int(2 * sampling_rate)
         
         # Apply morphological operations
-        swimming_mask = self._morphological_close(swimming_mask.astype(int), close_size)
-        swimming_mask = self._morphological_open(swimming_mask, open_size)
-        
-        # Find swimming segments
-        segments = self._find_segments(swimming_mask.astype(bool))
+        starts, ends = _close_runs(starts, ends, n_samples, close_size)
+        starts, ends = _open_runs(starts, ends, n_samples, open_size)
         
         # Filter out segments that are too short for a lap
-        min_lap_sec = self.config.get('min_lap_duration_sec', 10)
-        min_samples = int(min_lap_sec * sampling_rate)
-        segments = self._filter_short_segments(segments, min_samples)
+        min_samples = int(self.min_lap_sec * sampling_rate)
+        keep = (ends - starts) >= min_samples
         
-        return segments
+        return list(zip(starts[keep].tolist(), ends[keep].tolist()))
     
     def refine_lap_boundaries(self, sensor_data: SensorData, 
                              segments: List[Tuple[int, int]],
@@ -215,30 +199,36 @@ class PitchRollSegmenter(ISegmenter):
         if sampling_rate is None:
             sampling_rate = self.sampling_rate
             
+        if not segments:
+            return []
+        
+        # Sample-to-sample magnitude jumps for the whole session, computed
+        # once; each window is then just an argmax over a view.
+        # jumps[i] is the change between samples i and i + 1.
+        magnitudes = sensor_data.accel_magnitude
+        n_samples = len(magnitudes)
+        jumps = np.abs(np.diff(magnitudes))
+        
+        # Look for acceleration spike near boundaries
+        window = int(2 * sampling_rate)  # 2 second window
+        
         refined = []
         for start, end in segments:
-            # Look for acceleration spike near boundaries
-            window = int(2 * sampling_rate)  # 2 second window
-            
             # Refine start - look for sudden activity increase
-            start_region = sensor_data.accel[max(0, start - window):start + window]
-            if len(start_region) > 0:
-                magnitudes = np.sqrt(np.sum(start_region ** 2, axis=1))
-                spike_idx = np.argmax(np.abs(np.diff(magnitudes)))
-                new_start = max(0, start - window) + spike_idx
+            lo, hi = max(0, start - window), min(n_samples, start + window)
+            if hi > lo:
+                new_start = lo + int(np.argmax(jumps[lo:hi - 1]))
             else:
                 new_start = start
             
             # Refine end - look for sudden activity decrease
-            end_region = sensor_data.accel[max(0, end - window):min(len(sensor_data.accel), end + window)]
-            if len(end_region) > 0:
-                magnitudes = np.sqrt(np.sum(end_region ** 2, axis=1))
-                spike_idx = np.argmax(np.abs(np.diff(magnitudes)))
-                new_end = max(0, end - window) + spike_idx
+            lo, hi = max(0, end - window), min(n_samples, end + window)
+            if hi > lo:
+                new_end = lo + int(np.argmax(jumps[lo:hi - 1]))
             else:
                 new_end = end
             
-            refined.append((new_start, min(new_end, len(sensor_data.accel))))
+            refined.append((new_start, min(new_end, n_samples)))
         
         return refined
 
@@ -254,6 +244,8 @@ class NullProbabilitySegmenter(ISegmenter):
     def __init__(self, null_probs: Optional[np.ndarray] = None):
         self.null_probs = null_probs
         self.config = get_algorithm_config().postprocessing_config
+        self.prob_threshold = self.config.get('smooth_nulls', {}).get('probability', 0.5)
+        self._fallback = PitchRollSegmenter()
     
     def set_null_probabilities(self, probs: np.ndarray):
         """Set null probability array from classifier output"""
@@ -268,30 +260,9 @@ class NullProbabilitySegmenter(ISegmenter):
         """
         if self.null_probs is None:
             # Fall back to acceleration-based segmentation
-            fallback = PitchRollSegmenter()
-            return fallback.segment(sensor_data, sampling_rate)
-        
-        # Get configuration
-        config = self.config.get('smooth_nulls', {})
-        prob_threshold = config.get('probability', 0.5)
+            return self._fallback.segment(sensor_data, sampling_rate)
         
         # Binary mask of swimming activity
-        swimming_mask = self.null_probs < prob_threshold
-        
-        # Find segments
-        segments = []
-        in_segment = False
-        start_idx = 0
-        
-        for i, is_active in enumerate(swimming_mask):
-            if is_active and not in_segment:
-                start_idx = i
-                in_segment = True
-            elif not is_active and in_segment:
-                segments.append((start_idx, i))
-                in_segment = False
-        
-        if in_segment:
-            segments.append((start_idx, len(swimming_mask)))
+        swimming_mask = self.null_probs < self.prob_threshold
         
-        return segments
+        return _mask_to_segments(swimming_mask)
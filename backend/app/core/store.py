@@ -0,0 +1,285 @@
+"""
+Session Store
+Storage backends for uploaded session metadata and analysis results
+
+The API keeps session state behind the ISessionStore interface so it can
+live in process memory (single worker / development) or in Redis, where it
+is shared by all uvicorn workers and expires automatically.
+"""
+import json
+from abc import ABC, abstractmethod
+from datetime import datetime
+from typing import Any, Optional
+from uuid import UUID
+
+from ..config import get_settings
+from ..models import AnalysisResult
+from ..schemas import SessionStatus
+from .io import LAPS_ENCODING, decode_laps, encode_laps
+
+
+class ISessionStore(ABC):
+    """
+    Abstract interface for session state storage
+
+    Sessions are flat dicts of metadata fields; analysis results are
+    stored separately since they are written once and read rarely.
+    """
+
+    @abstractmethod
+    async def set_session(self, session_id: UUID, session: dict) -> None:
+        """Store (replace) a session's metadata"""
+        pass
+
+    @abstractmethod
+    async def get_session(self, session_id: UUID) -> Optional[dict]:
+        """Return a session's metadata, or None if unknown"""
+        pass
+
+    @abstractmethod
+    async def update_session(self, session_id: UUID, **fields: Any) -> None:
+        """Update individual metadata fields of an existing session"""
+        pass
+
+    @abstractmethod
+    async def delete_session(self, session_id: UUID) -> Optional[dict]:
+        """Remove a session and its result, returning the removed metadata"""
+        pass
+
+    @abstractmethod
+    async def set_result(self, session_id: UUID, result: AnalysisResult) -> None:
+        """Store the analysis result for a session"""
+        pass
+
+    @abstractmethod
+    async def get_result(self, session_id: UUID) -> Optional[AnalysisResult]:
+        """Return the analysis result for a session, or None"""
+        pass
+
+    async def close(self) -> None:
+        """Release any connections held by the store"""
+        pass
+
+
+class MemorySessionStore(ISessionStore):
+    """
+    In-process dict storage
+
+    State is per worker process and unbounded; suitable for development
+    and tests only.
+    """
+
+    def __init__(self):
+        self._sessions: dict[UUID, dict] = {}
+        self._results: dict[UUID, AnalysisResult] = {}
+
+    async def set_session(self, session_id: UUID, session: dict) -> None:
+        self._sessions[session_id] = dict(session)
+
+    async def get_session(self, session_id: UUID) -> Optional[dict]:
+        session = self._sessions.get(session_id)
+        return dict(session) if session is not None else None
+
+    async def update_session(self, session_id: UUID, **fields: Any) -> None:
+        if session_id in self._sessions:
+            self._sessions[session_id].update(fields)
+
+    async def delete_session(self, session_id: UUID) -> Optional[dict]:
+        self._results.pop(session_id, None)
+        return self._sessions.pop(session_id, None)
+
+    async def set_result(self, session_id: UUID, result: AnalysisResult) -> None:
+        self._results[session_id] = result
+
+    async def get_result(self, session_id: UUID) -> Optional[AnalysisResult]:
+        return self._results.get(session_id)
+
+
+# Session fields stored as JSON strings that are rebuilt into richer types
+_SESSION_FIELD_TYPES = {
+    'id': UUID,
+    'status': SessionStatus,
+    'uploaded_at': datetime.fromisoformat,
+}
+
+# HSET the given fields only if the session still exists, refreshing its
+# expiry in the same step. ARGV = [ttl_sec, name1, value1, name2, ...]
+_UPDATE_SESSION_SCRIPT = """
+if redis.call('EXISTS', KEYS[1]) == 0 then
+    return 0
+end
+redis.call('HSET', KEYS[1], unpack(ARGV, 2))
+redis.call('EXPIRE', KEYS[1], ARGV[1])
+return 1
+"""
+
+
+def _json_default(value: Any) -> Any:
+    """JSON encoding of the non-native session field types"""
+    if isinstance(value, UUID):
+        return str(value)
+    if isinstance(value, datetime):
+        return value.isoformat()
+    raise TypeError(f"Cannot store value of type {type(value).__name__}")
+
+
+def _encode_fields(fields: dict) -> dict[str, bytes]:
+    """Encode session fields as one JSON value per hash field"""
+    return {
+        name: json.dumps(value, default=_json_default).encode()
+        for name, value in fields.items()
+    }
+
+
+def _decode_fields(fields: dict[bytes, bytes]) -> dict:
+    """Decode hash fields written by _encode_fields()"""
+    session = {}
+    for raw_name, raw_value in fields.items():
+        name = raw_name.decode()
+        value = json.loads(raw_value)
+        if value is not None and name in _SESSION_FIELD_TYPES:
+            value = _SESSION_FIELD_TYPES[name](value)
+        session[name] = value
+    return session
+
+
+def _encode_result(result: AnalysisResult) -> dict[str, bytes]:
+    """
+    Encode an analysis result as hash fields
+
+    Scalars go into a JSON 'meta' field and the laps into 'laps' via
+    encode_laps(). The filtered sensor arrays are not stored.
+    """
+    meta = {
+        'session_id': str(result.session_id),
+        'processed_at': result.processed_at.isoformat(),
+        'pool_length_m': result.pool_length_m,
+        'laps_encoding': LAPS_ENCODING,
+    }
+    return {
+        'meta': json.dumps(meta).encode(),
+        'laps': encode_laps(result.laps),
+    }
+
+
+def _decode_result(fields: dict[bytes, bytes]) -> AnalysisResult:
+    """Rebuild an analysis result from _encode_result() hash fields"""
+    meta = json.loads(fields[b'meta'])
+    return AnalysisResult(
+        session_id=UUID(meta['session_id']),
+        processed_at=datetime.fromisoformat(meta['processed_at']),
+        pool_length_m=meta['pool_length_m'],
+        laps=decode_laps(fields[b'laps'], meta['laps_encoding']),
+    ).finalize()
+
+
+class RedisSessionStore(ISessionStore):
+    """
+    Redis-backed storage shared across API workers
+
+    Each session is a Redis hash with one JSON value per field, so
+    progress/status updates are a single HSET instead of rewriting the
+    whole session. Results are a hash of JSON metadata plus the laps
+    (Arrow IPC when pyarrow is installed). Nothing is unpickled, so the
+    store never executes code from Redis. All keys expire after ttl_sec.
+    """
+
+    def __init__(self, url: str, ttl_sec: int = 86400):
+        import redis.asyncio as redis
+
+        self._redis = redis.from_url(url)
+        self._update_script = self._redis.register_script(_UPDATE_SESSION_SCRIPT)
+        self.ttl_sec = ttl_sec
+
+    @staticmethod
+    def _session_key(session_id: UUID) -> str:
+        return f"aquametric:session:{session_id}"
+
+    @staticmethod
+    def _result_key(session_id: UUID) -> str:
+        return f"aquametric:result:{session_id}"
+
+    async def _replace_hash(self, key: str, mapping: dict[str, bytes]) -> None:
+        """Atomically replace a hash and set its expiry"""
+        async with self._redis.pipeline(transaction=True) as pipe:
+            pipe.delete(key)
+            pipe.hset(key, mapping=mapping)
+            pipe.expire(key, self.ttl_sec)
+            await pipe.execute()
+
+    async def set_session(self, session_id: UUID, session: dict) -> None:
+        await self._replace_hash(self._session_key(session_id), _encode_fields(session))
+
+    async def get_session(self, session_id: UUID) -> Optional[dict]:
+        fields = await self._redis.hgetall(self._session_key(session_id))
+        if not fields:
+            return None
+        return _decode_fields(fields)
+
+    async def update_session(self, session_id: UUID, **fields: Any) -> None:
+        if not fields:
+            return
+        # Existence check, HSET and EXPIRE run as one script, so an update
+        # racing with expiry cannot recreate the key without a TTL
+        args = [self.ttl_sec]
+        for name, value in _encode_fields(fields).items():
+            args += [name, value]
+        await self._update_script(keys=[self._session_key(session_id)], args=args)
+
+    async def delete_session(self, session_id: UUID) -> Optional[dict]:
+        session = await self.get_session(session_id)
+        await self._redis.delete(self._session_key(session_id), self._result_key(session_id))
+        return session
+
+    async def set_result(self, session_id: UUID, result: AnalysisResult) -> None:
+        await self._replace_hash(self._result_key(session_id), _encode_result(result))
+
+    async def get_result(self, session_id: UUID) -> Optional[AnalysisResult]:
+        fields = await self._redis.hgetall(self._result_key(session_id))
+        return _decode_result(fields) if fields else None
+
+    async def close(self) -> None:
+        await self._redis.aclose()
+
+
+def create_session_store(backend: str, redis_url: str, ttl_sec: int = 86400) -> ISessionStore:
+    """
+    Factory for the configured session store backend
+
+    Args:
+        backend: 'memory' or 'redis'
+        redis_url: Redis connection URL (used by the redis backend)
+        ttl_sec: Expiry for stored sessions and results
+
+    Returns:
+        Session store instance
+    """
+    if backend == 'redis':
+        return RedisSessionStore(redis_url, ttl_sec)
+    if backend == 'memory':
+        return MemorySessionStore()
+    raise ValueError(f"Unknown session store backend: {backend}")
+
+
+_store: Optional[ISessionStore] = None
+
+
+def get_session_store() -> ISessionStore:
+    """Return the application session store, creating it on first use"""
+    global _store
+    if _store is None:
+        settings = get_settings()
+        _store = create_session_store(
+            settings.session_store,
+            settings.redis.url,
+            settings.session_ttl_sec
+        )
+    return _store
+
+
+async def close_session_store() -> None:
+    """Close the application session store if it was created"""
+    global _store
+    if _store is not None:
+        await _store.close()
+        _store = None
@@ -2,14 +2,110 @@
 Stroke Counter Implementation
 Count individual strokes within a lap based on repetitive motion patterns
 """
+from bisect import bisect_right
+from functools import lru_cache
+
 import numpy as np
 from typing import Optional
+from scipy import fft as sfft
 from scipy.signal import find_peaks
 
+try:
+    from pyfftw.interfaces import cache as _fftw_cache
+    from pyfftw.interfaces import scipy_fft as _fftw
+except ImportError:  # pragma: no cover - optional dependency
+    _fftw_cache = None
+    _fftw = None
+
 from .interfaces import IStrokeCounter
 from ..schemas import StrokeType
 
 
+# Expected stroke frequency range per stroke type, (min_freq, max_freq) in Hz
+_FREQUENCY_RANGES = {
+    StrokeType.FREESTYLE: (0.6, 1.5),
+    StrokeType.BACKSTROKE: (0.5, 1.2),
+    StrokeType.BREASTSTROKE: (0.3, 0.8),
+    StrokeType.BUTTERFLY: (0.4, 1.0),
+    StrokeType.UNKNOWN: (0.3, 1.5),
+}
+_DEFAULT_FREQUENCY_RANGE = (0.3, 1.5)
+
+# Strokes with alternating arms, dominated by roll (Y-axis) motion
+_BILATERAL_STROKES = frozenset((StrokeType.FREESTYLE, StrokeType.BACKSTROKE))
+
+# Shortest lap (in samples) that count_strokes_fft analyzes spectrally
+_MIN_FFT_SAMPLES = 30
+
+# Hybrid peak-count weight by lap duration: below 15 s, below 30 s, longer
+_HYBRID_DURATION_LIMITS = (15, 30)
+_HYBRID_PEAK_WEIGHTS = (0.8, 0.6, 0.4)
+
+
+@lru_cache(maxsize=1)
+def _get_rfft():
+    """
+    Real FFT used for spectral counting, resolved on first use
+    
+    With pyfftw installed, FFTW plans are cached per (length, dtype) and
+    reused across the laps of a session; otherwise scipy.fft's PocketFFT
+    is used. Only this module's transforms are routed to FFTW, the
+    global scipy.fft backend is left alone.
+    """
+    if _fftw is None:
+        return sfft.rfft
+    _fftw_cache.enable()
+    _fftw_cache.set_keepalive_time(60)
+    return _fftw.rfft
+
+
+@lru_cache(maxsize=None)
+def _min_peak_distance(stroke_type: StrokeType, sampling_rate: float) -> int:
+    """Minimum samples between strokes at the type's maximum stroke frequency"""
+    _, max_freq = _FREQUENCY_RANGES.get(stroke_type, _DEFAULT_FREQUENCY_RANGE)
+    min_period = 1.0 / max_freq  # seconds between strokes
+    return int(min_period * sampling_rate)
+
+
+def _band_bins(n: int, sampling_rate: float, min_freq: float,
+               max_freq: float) -> tuple[int, int]:
+    """
+    Range [lo, hi) of rfft bins of an n-sample signal within a frequency band
+    
+    Bin k lies in the band iff min_freq <= rfftfreq(n)[k] <= max_freq, using
+    the same k * (1 / (n * d)) frequencies as rfftfreq. The DC bin is
+    never included.
+    """
+    df = 1.0 / (n * (1.0 / sampling_rate))
+    n_bins = n // 2 + 1
+    
+    lo = max(1, int(np.ceil(min_freq / df)))
+    while lo > 1 and (lo - 1) * df >= min_freq:
+        lo -= 1
+    while lo < n_bins and lo * df < min_freq:
+        lo += 1
+    
+    hi = int(np.floor(max_freq / df)) + 1
+    while hi > lo and (hi - 1) * df > max_freq:
+        hi -= 1
+    while hi < n_bins and hi * df <= max_freq:
+        hi += 1
+    
+    return lo, min(max(hi, lo), n_bins)
+
+
+def _stroke_signal(lap_data: np.ndarray, stroke_type: StrokeType) -> np.ndarray:
+    """
+    Mean-removed primary motion axis of a lap
+    
+    Uses the Y-axis (roll) for bilateral strokes and the Z-axis
+    (vertical) otherwise. Lap data sliced from SensorData is column-major,
+    so the axis is contiguous and centering is a single pass.
+    """
+    signal = lap_data[:, 1 if stroke_type in _BILATERAL_STROKES else 2]
+    return signal - np.mean(signal)
+
+
 class BasicStrokeCounter(IStrokeCounter):
     """
     Stroke counter using peak detection in acceleration signal
@@ -37,14 +133,7 @@ class BasicStrokeCounter(IStrokeCounter):
         Returns:
             (min_freq, max_freq) in Hz
         """
-        frequency_ranges = {
-            StrokeType.FREESTYLE: (0.6, 1.5),
-            StrokeType.BACKSTROKE: (0.5, 1.2),
-            StrokeType.BREASTSTROKE: (0.3, 0.8),
-            StrokeType.BUTTERFLY: (0.4, 1.0),
-            StrokeType.UNKNOWN: (0.3, 1.5),
-        }
-        return frequency_ranges.get(stroke_type, (0.3, 1.5))
+        return _FREQUENCY_RANGES.get(stroke_type, _DEFAULT_FREQUENCY_RANGE)
     
     def _calculate_min_peak_distance(self, stroke_type: StrokeType) -> int:
         """
@@ -52,9 +141,7 @@ class BasicStrokeCounter(IStrokeCounter):
         
         Based on maximum stroke frequency for the stroke type.
         """
-        _, max_freq = self._get_stroke_frequency_range(stroke_type)
-        min_period = 1.0 / max_freq  # seconds between strokes
-        return int(min_period * self.sampling_rate)
+        return _min_peak_distance(stroke_type, self.sampling_rate)
     
     def count_strokes(self, lap_data: np.ndarray, stroke_type: StrokeType = StrokeType.UNKNOWN) -> int:
         """
@@ -73,17 +160,11 @@ class BasicStrokeCounter(IStrokeCounter):
         if len(lap_data) < 10:
             return 0
         
-        # Select axis based on stroke type
-        if stroke_type in [StrokeType.FREESTYLE, StrokeType.BACKSTROKE]:
-            # Roll motion is dominant
-            signal = lap_data[:, 1]  # Y-axis
-        else:
-            # Vertical undulation is dominant
-            signal = lap_data[:, 2]  # Z-axis
-        
-        # Normalize signal
-        signal = signal - np.mean(signal)
-        
+        # Select axis based on stroke type and normalize it
+        return self._count_peaks(_stroke_signal(lap_data, stroke_type), stroke_type)
+    
+    def _count_peaks(self, signal: np.ndarray, stroke_type: StrokeType) -> int:
+        """Peak-detection stroke count of a mean-removed stroke signal"""
         # Get minimum peak distance
         min_distance = self._calculate_min_peak_distance(stroke_type)
         min_distance = max(3, min_distance)  # At least 3 samples apart
@@ -91,15 +172,14 @@ class BasicStrokeCounter(IStrokeCounter):
         # Find positive peaks
         peaks_pos, _ = find_peaks(signal, distance=min_distance)
         
-        # Find negative peaks
-        peaks_neg, _ = find_peaks(-signal, distance=min_distance)
-        
         # For bilateral strokes (freestyle, backstroke), count both arms
-        if stroke_type in [StrokeType.FREESTYLE, StrokeType.BACKSTROKE]:
+        if stroke_type in _BILATERAL_STROKES:
             # Each arm produces one peak cycle
             stroke_count = len(peaks_pos)
         else:
-            # Symmetric strokes - use maximum of pos/neg peaks
+            # Symmetric strokes - use maximum of pos/neg peaks; the
+            # negative peaks are only needed here
+            peaks_neg, _ = find_peaks(-signal, distance=min_distance)
             stroke_count = max(len(peaks_pos), len(peaks_neg))
         
         return stroke_count
@@ -117,44 +197,68 @@ class BasicStrokeCounter(IStrokeCounter):
         Returns:
             Estimated stroke count
         """
-        if len(lap_data) < 30:
+        if len(lap_data) < _MIN_FFT_SAMPLES:
             # Not enough data for FFT
             return self.count_strokes(lap_data, stroke_type)
         
         # Select primary axis
-        if stroke_type in [StrokeType.FREESTYLE, StrokeType.BACKSTROKE]:
-            signal = lap_data[:, 1]
-        else:
-            signal = lap_data[:, 2]
-        
-        # Compute FFT
+        return self._count_fft(_stroke_signal(lap_data, stroke_type), stroke_type)
+    
+    def _count_fft(self, signal: np.ndarray, stroke_type: StrokeType) -> int:
+        """Spectral stroke count of a mean-removed stroke signal"""
+        # Compute real FFT. Not zero-padded to a fast length: the bins
+        # must stay at multiples of 1 / duration so that
+        # frequency * duration below is a whole stroke count.
         n = len(signal)
-        fft = np.fft.fft(signal - np.mean(signal))
-        freqs = np.fft.fftfreq(n, d=1.0/self.sampling_rate)
+        fft = _get_rfft()(signal)
         
-        # Get magnitude spectrum (positive frequencies only)
-        positive_mask = freqs > 0
-        magnitudes = np.abs(fft[positive_mask])
-        positive_freqs = freqs[positive_mask]
-        
-        # Find dominant frequency in expected range
+        # Find dominant frequency in expected range; only the in-band
+        # bins' magnitudes are computed and searched
         min_freq, max_freq = self._get_stroke_frequency_range(stroke_type)
-        freq_mask = (positive_freqs >= min_freq) & (positive_freqs <= max_freq)
+        lo, hi = _band_bins(n, self.sampling_rate, min_freq, max_freq)
         
-        if not np.any(freq_mask):
+        if hi <= lo:
             return 0
         
-        masked_mags = magnitudes.copy()
-        masked_mags[~freq_mask] = 0
-        
-        dominant_idx = np.argmax(masked_mags)
-        dominant_freq = positive_freqs[dominant_idx]
+        band = np.abs(fft[lo:hi])
+        dominant_bin = lo + int(np.argmax(band))
+        if band[dominant_bin - lo] == 0:
+            # Flat spectrum: like an argmax over the zero-masked spectrum,
+            # fall back to the first positive bin
+            dominant_bin = 1
+        # Bin frequency as computed by rfftfreq
+        dominant_freq = dominant_bin * (1.0 / (n * (1.0 / self.sampling_rate)))
         
         # Calculate stroke count from frequency and duration
         duration_sec = n / self.sampling_rate
         stroke_count = int(dominant_freq * duration_sec)
         
         return stroke_count
+    
+    def count_strokes_both(self, lap_data: np.ndarray,
+                           stroke_type: StrokeType) -> tuple[int, int]:
+        """
+        Peak-detection and FFT stroke counts of a lap in one call
+        
+        Equivalent to (count_strokes(...), count_strokes_fft(...)), but the
+        stroke axis is extracted and centered once and shared by both.
+        
+        Args:
+            lap_data: Accelerometer data, shape (N, 3)
+            stroke_type: Type of stroke
+            
+        Returns:
+            (peak_count, fft_count)
+        """
+        if len(lap_data) < 10:
+            return 0, 0
+        
+        signal = _stroke_signal(lap_data, stroke_type)
+        peak_count = self._count_peaks(signal, stroke_type)
+        if len(signal) < _MIN_FFT_SAMPLES:
+            # Too short for the FFT, which would repeat the peak detection
+            return peak_count, peak_count
+        return peak_count, self._count_fft(signal, stroke_type)
 
 
 class HybridStrokeCounter(IStrokeCounter):
@@ -172,21 +276,14 @@ class HybridStrokeCounter(IStrokeCounter):
         """
         Count strokes using hybrid approach
         """
-        # Get both estimates
-        peak_count = self.basic_counter.count_strokes(lap_data, stroke_type)
-        fft_count = self.basic_counter.count_strokes_fft(lap_data, stroke_type)
+        # Get both estimates from a single extraction of the stroke axis
+        peak_count, fft_count = self.basic_counter.count_strokes_both(lap_data, stroke_type)
         
         # Weighted average (favor peak detection for short laps)
         duration = len(lap_data) / self.sampling_rate
         
-        if duration < 15:
-            # Short lap - trust peaks more
-            weight = 0.8
-        elif duration < 30:
-            weight = 0.6
-        else:
-            # Long lap - trust FFT more
-            weight = 0.4
+        # Short lap - trust peaks more; long lap - trust FFT more
+        weight = _HYBRID_PEAK_WEIGHTS[bisect_right(_HYBRID_DURATION_LIMITS, duration)]
         
         hybrid_count = int(weight * peak_count + (1 - weight) * fft_count)
         
@@ -8,6 +8,8 @@ from fastapi.middleware.cors import CORSMiddleware
 
 from .config import get_settings
 from .api.v1 import router as api_v1_router
+from .core.store import close_session_store
+from .tasks import purge_session_cache, shutdown_executor
 
 
 @asynccontextmanager
@@ -15,9 +17,14 @@ async def lifespan(app: FastAPI):
     """Application lifecycle management"""
     # Startup
     print("Starting AquaMetric API...")
+    # Drop upload caches orphaned by a previous run; sessions older than
+    # the store TTL can no longer be looked up anyway
+    purge_session_cache(get_settings().session_ttl_sec)
     yield
     # Shutdown
     print("Shutting down AquaMetric API...")
+    shutdown_executor()
+    await close_session_store()
 
 
 def create_app() -> FastAPI:
@@ -12,17 +12,93 @@ import numpy as np
 from .schemas import StrokeType
 
 
+def _as_columns(data: Optional[np.ndarray]) -> Optional[np.ndarray]:
+    """
+    Return a float32 (N, 3) array whose axis columns are each contiguous
+    
+    Arrays that already have this layout (including row slices of such
+    arrays) are returned unchanged; others are copied once into
+    column-major (Fortran) order.
+    """
+    if data is None:
+        return None
+    data = np.asarray(data)
+    if data.dtype == np.float32 and data.ndim == 2 and data.strides[0] == data.itemsize:
+        return data
+    return np.asfortranarray(data, dtype=np.float32)
+
+
+def _magnitude(data: np.ndarray) -> np.ndarray:
+    """
+    Row-wise Euclidean norm of an (N, 3) array
+    
+    einsum forms the sum of squares in a single pass, without any
+    squared temporaries; the square root is then taken in place.
+    """
+    magnitude = np.einsum('ij,ij->i', data, data)
+    return np.sqrt(magnitude, out=magnitude)
+
+
 @dataclass
 class SensorData:
     """
     Raw sensor data container
     Holds accelerometer, gyroscope, and optionally magnetometer data
+    
+    The (N, 3) sensor arrays are stored as float32 in column-major
+    (struct-of-arrays) order, so each axis is a contiguous block and
+    per-axis reductions run at unit stride. MEMS sensor resolution is
+    far below float32 precision, so nothing is lost over float64.
     """
     timestamps: np.ndarray  # Shape: (N,) - timestamps in nanoseconds
-    accel: np.ndarray       # Shape: (N, 3) - acceleration [x, y, z]
-    gyro: np.ndarray        # Shape: (N, 3) - angular velocity [x, y, z]
-    mag: Optional[np.ndarray] = None  # Shape: (N, 3) - magnetic field [x, y, z]
+    accel: np.ndarray       # Shape: (N, 3) float32 - acceleration [x, y, z]
+    gyro: np.ndarray        # Shape: (N, 3) float32 - angular velocity [x, y, z]
+    mag: Optional[np.ndarray] = None  # Shape: (N, 3) float32 - magnetic field [x, y, z]
     pressure: Optional[np.ndarray] = None  # Shape: (N,) - pressure readings
+    _accel_magnitude: Optional[np.ndarray] = field(
+        default=None, init=False, repr=False, compare=False
+    )
+    
+    def __post_init__(self):
+        self.accel = _as_columns(self.accel)
+        self.gyro = _as_columns(self.gyro)
+        self.mag = _as_columns(self.mag)
+    
+    @property
+    def accel_magnitude(self) -> np.ndarray:
+        """
+        Acceleration magnitude per sample, shape (N,)
+        
+        Computed on first access and shared by all analysis stages that
+        need it; treat the result (and accel) as read-only.
+        """
+        if self._accel_magnitude is None:
+            self._accel_magnitude = _magnitude(self.accel)
+        return self._accel_magnitude
+    
+    @property
+    def acc_x(self) -> np.ndarray:
+        return self.accel[:, 0]
+    
+    @property
+    def acc_y(self) -> np.ndarray:
+        return self.accel[:, 1]
+    
+    @property
+    def acc_z(self) -> np.ndarray:
+        return self.accel[:, 2]
+    
+    @property
+    def gyro_x(self) -> np.ndarray:
+        return self.gyro[:, 0]
+    
+    @property
+    def gyro_y(self) -> np.ndarray:
+        return self.gyro[:, 1]
+    
+    @property
+    def gyro_z(self) -> np.ndarray:
+        return self.gyro[:, 2]
     
     @property
     def length(self) -> int:
@@ -36,14 +112,26 @@ class SensorData:
         return (self.timestamps[-1] - self.timestamps[0]) / 1e9
     
     def slice(self, start_idx: int, end_idx: int) -> "SensorData":
-        """Extract a slice of the sensor data"""
-        return SensorData(
-            timestamps=self.timestamps[start_idx:end_idx],
-            accel=self.accel[start_idx:end_idx],
-            gyro=self.gyro[start_idx:end_idx],
-            mag=self.mag[start_idx:end_idx] if self.mag is not None else None,
-            pressure=self.pressure[start_idx:end_idx] if self.pressure is not None else None
-        )
+        """
+        Extract a slice of the sensor data
+        
+        All arrays (including a computed accel_magnitude) are views into
+        this instance's arrays. Row slices already satisfy the storage
+        layout, so __post_init__ is bypassed.
+        """
+        window = slice(start_idx, end_idx)
+        
+        def _view(data: Optional[np.ndarray]) -> Optional[np.ndarray]:
+            return data[window] if data is not None else None
+        
+        sliced = SensorData.__new__(SensorData)
+        sliced.timestamps = self.timestamps[window]
+        sliced.accel = self.accel[window]
+        sliced.gyro = _view(self.gyro)
+        sliced.mag = _view(self.mag)
+        sliced.pressure = _view(self.pressure)
+        sliced._accel_magnitude = _view(self._accel_magnitude)
+        return sliced
 
 
 @dataclass
@@ -114,10 +202,40 @@ class SwimLap:
         return (self.duration_sec / self.pool_length_m) * 100
 
 
+# Stroke types by small integer code, for counting laps in NumPy
+_STROKE_CODES = tuple(StrokeType)
+_STROKE_INDEX = {stroke: i for i, stroke in enumerate(_STROKE_CODES)}
+
+
+def _stroke_summary(codes: np.ndarray) -> tuple[dict[StrokeType, int], StrokeType]:
+    """
+    Count stroke codes and pick the most common stroke
+    
+    The counts are keyed in order of first appearance, matching counting
+    laps into a dict one by one; ties for the most common stroke go to
+    the one that appeared first, as max() over that dict would.
+    
+    Returns:
+        (breakdown, primary_stroke)
+    """
+    if not len(codes):
+        return {}, StrokeType.UNKNOWN
+    counts = np.bincount(codes, minlength=len(_STROKE_CODES))
+    present, first_seen = np.unique(codes, return_index=True)
+    order = present[np.argsort(first_seen)]
+    primary = order[np.argmax(counts[order])]
+    breakdown = {_STROKE_CODES[code]: int(counts[code]) for code in order.tolist()}
+    return breakdown, _STROKE_CODES[primary]
+
+
 @dataclass
 class AnalysisResult:
     """
     Complete analysis result for a session
+    
+    The session aggregates are derived from the laps on every access
+    until finalize() is called; after that they are served from a summary
+    computed in a single pass. Call finalize() again after modifying laps.
     """
     session_id: UUID
     processed_at: datetime
@@ -125,6 +243,59 @@ class AnalysisResult:
     laps: List[SwimLap] = field(default_factory=list)
     filtered_accel: Optional[np.ndarray] = None
     filtered_gyro: Optional[np.ndarray] = None
+    _summary: Optional[dict] = field(default=None, init=False, repr=False, compare=False)
+    
+    def _summarize(self) -> dict:
+        """
+        Compute all session aggregates in one pass over the laps
+        
+        The per-lap fields are gathered into arrays once (struct of
+        arrays) and the sums, SWOLF and pace are evaluated in NumPy.
+        """
+        n_laps = len(self.laps)
+        if not n_laps:
+            return {
+                'total_distance_m': 0,
+                'total_duration_sec': 0.0,
+                'avg_swolf': 0.0,
+                'avg_pace_per_100m': 0.0,
+                'breakdown': {},
+                'primary_stroke': StrokeType.UNKNOWN,
+            }
+        
+        durations = np.empty(n_laps, dtype=np.float64)
+        stroke_counts = np.empty(n_laps, dtype=np.int64)
+        pool_lengths = np.empty(n_laps, dtype=np.int64)
+        codes = np.empty(n_laps, dtype=np.int8)
+        for i, lap in enumerate(self.laps):
+            durations[i] = lap.duration_sec
+            stroke_counts[i] = lap.stroke_count
+            pool_lengths[i] = lap.pool_length_m
+            codes[i] = _STROKE_INDEX[lap.stroke_type]
+        
+        # Same formulas as SwimLap.swolf / pace_per_100m (distance_m is the
+        # pool length); int() and astype both truncate toward zero
+        swolf = (durations + stroke_counts).astype(np.int64)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            pace = np.where(pool_lengths > 0, durations / pool_lengths * 100, 0.0)
+        
+        breakdown, primary_stroke = _stroke_summary(codes)
+        return {
+            'total_distance_m': int(pool_lengths.sum()),
+            'total_duration_sec': float(durations.sum()),
+            'avg_swolf': float(swolf.sum()) / n_laps,
+            'avg_pace_per_100m': float(pace.sum()) / n_laps,
+            'breakdown': breakdown,
+            'primary_stroke': primary_stroke,
+        }
+    
+    def _aggregates(self) -> dict:
+        return self._summary if self._summary is not None else self._summarize()
+    
+    def finalize(self) -> "AnalysisResult":
+        """Freeze the session aggregates for the current laps"""
+        self._summary = self._summarize()
+        return self
     
     @property
     def total_laps(self) -> int:
@@ -132,35 +303,25 @@ class AnalysisResult:
     
     @property
     def total_distance_m(self) -> int:
-        return sum(lap.distance_m for lap in self.laps)
+        return self._aggregates()['total_distance_m']
     
     @property
     def total_duration_sec(self) -> float:
-        return sum(lap.duration_sec for lap in self.laps)
+        return self._aggregates()['total_duration_sec']
     
     @property
     def avg_swolf(self) -> float:
-        if not self.laps:
-            return 0.0
-        return sum(lap.swolf for lap in self.laps) / len(self.laps)
+        return self._aggregates()['avg_swolf']
     
     @property
     def avg_pace_per_100m(self) -> float:
-        if not self.laps:
-            return 0.0
-        return sum(lap.pace_per_100m for lap in self.laps) / len(self.laps)
+        return self._aggregates()['avg_pace_per_100m']
     
     def get_stroke_breakdown(self) -> dict[StrokeType, int]:
         """Count laps by stroke type"""
-        breakdown = {}
-        for lap in self.laps:
-            breakdown[lap.stroke_type] = breakdown.get(lap.stroke_type, 0) + 1
-        return breakdown
+        return dict(self._aggregates()['breakdown'])
     
     @property
     def primary_stroke(self) -> StrokeType:
         """Most common stroke type in the session"""
-        breakdown = self.get_stroke_breakdown()
-        if not breakdown:
-            return StrokeType.UNKNOWN
-        return max(breakdown, key=breakdown.get)
+        return self._aggregates()['primary_stroke']
@@ -0,0 +1,100 @@
+"""
+Background Analysis Tasks
+CPU-bound session analysis executed in a process pool
+
+Running the pipeline in worker processes keeps the API event loop
+responsive and lets several uploaded sessions be analyzed in parallel.
+"""
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from pathlib import Path
+from typing import Optional
+from uuid import UUID, uuid4
+
+from .config import get_settings
+from .core.io import read_sensor_cache
+from .models import SessionData, SensorData, AnalysisResult
+
+
+_executor: Optional[ProcessPoolExecutor] = None
+
+
+def get_executor() -> ProcessPoolExecutor:
+    """Return the shared analysis process pool, creating it on first use"""
+    global _executor
+    if _executor is None:
+        _executor = ProcessPoolExecutor(max_workers=get_settings().analysis_workers)
+    return _executor
+
+
+def shutdown_executor() -> None:
+    """Shut down the analysis process pool if it was started"""
+    global _executor
+    if _executor is not None:
+        _executor.shutdown(wait=True, cancel_futures=True)
+        _executor = None
+
+
+def purge_session_cache(max_age_sec: float) -> int:
+    """
+    Remove upload cache files older than max_age_sec
+
+    Cache files are deleted as soon as their analysis finishes; this only
+    catches files left behind when a worker died mid-analysis.
+
+    Returns:
+        Number of files removed
+    """
+    cache_dir = get_settings().session_cache_dir
+    if not cache_dir.is_dir():
+        return 0
+    cutoff = time.time() - max_age_sec
+    removed = 0
+    for path in cache_dir.iterdir():
+        if path.is_file() and path.stat().st_mtime < cutoff:
+            path.unlink(missing_ok=True)
+            removed += 1
+    return removed
+
+
+def analyze_cached_session(
+    cache_path: Path,
+    session_id: UUID,
+    pool_length_m: int
+) -> AnalysisResult:
+    """
+    Analyze a session from its upload cache file
+
+    Top-level function so it can be pickled into a worker process.
+
+    Args:
+        cache_path: File written by write_sensor_cache()
+        session_id: Session identifier
+        pool_length_m: Pool length in meters
+
+    Returns:
+        Analysis result for the session
+    """
+    timestamps, accel, gyro, mag = read_sensor_cache(cache_path)
+
+    session = SessionData(
+        session_id=session_id,
+        user_id=uuid4(),  # Would come from auth in production
+        pool_length_m=pool_length_m,
+        start_time=datetime.now(),
+        sensor_data=SensorData(
+            timestamps=timestamps,
+            accel=accel,
+            gyro=gyro,
+            mag=mag
+        )
+    )
+
+    # Imported here so the API process only loads SciPy once a session
+    # is actually analyzed
+    from .core import get_pipeline
+
+    # Note: Data is 30Hz, configure pipeline accordingly
+    pipeline = get_pipeline(sampling_rate=30.0)
+    return pipeline.analyze(session)
@@ -0,0 +1,149 @@
+"""
+AquaMetric API Tests
+セッションアップロードAPIのテスト
+
+使用方法:
+    cd aquametric/backend
+    python -m pytest tests/test_api.py
+"""
+import sys
+from pathlib import Path
+
+# プロジェクトルートをパスに追加
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+import numpy as np
+import pytest
+from fastapi.testclient import TestClient
+
+from app.api.v1.sessions import RAW_CONTENT_TYPE
+from app.config import get_settings
+from app.core.io import RAW_SENSOR_DTYPE
+from app.main import create_app
+from tests.test_io import make_csv
+
+
+@pytest.fixture
+def cache_dir(tmp_path, monkeypatch):
+    """アップロードキャッシュの保存先を一時ディレクトリに差し替え"""
+    monkeypatch.setattr(get_settings(), 'session_cache_dir', tmp_path)
+    return tmp_path
+
+
+@pytest.fixture
+def client(cache_dir):
+    with TestClient(create_app()) as client:
+        yield client
+
+
+def upload(client: TestClient, data: bytes, content_type: str = 'text/csv'):
+    """ファイルをアップロードし、レスポンスを返す"""
+    return client.post(
+        '/api/v1/sessions/upload',
+        files={'file': ('session.csv', data, content_type)},
+    )
+
+
+def make_raw(n_records: int = 600, seed: int = 0) -> bytes:
+    """RAW_SENSOR_DTYPE形式の模擬バイナリを生成"""
+    rng = np.random.default_rng(seed)
+    records = np.zeros(n_records, dtype=RAW_SENSOR_DTYPE)
+    records['t'] = np.arange(n_records) * 33_333_333
+    for name in ('ax', 'ay', 'az', 'gx', 'gy', 'gz'):
+        records[name] = rng.integers(-4000, 4000, n_records)
+    return records.tobytes()
+
+
+def wait_for_analysis(client: TestClient, session_id: str) -> dict:
+    """解析結果を取得(TestClientでは解析はレスポンス後に同期実行される)"""
+    status = client.get(f'/api/v1/sessions/{session_id}/status').json()
+    assert status['status'] == 'completed', status
+    response = client.get(f'/api/v1/sessions/{session_id}/analysis')
+    assert response.status_code == 200
+    return response.json()
+
+
+@pytest.mark.parametrize('content_type', ['text/csv', 'application/octet-stream'])
+def test_upload_csv(client, content_type):
+    """CSVは送信時のContent-Typeに関わらずCSVとして解析されること"""
+    # レコード長(20バイト)の倍数になるCSV
+    data, _ = make_csv(n_samples=600)
+    data += b'\n' * (-len(data) % RAW_SENSOR_DTYPE.itemsize)
+    assert len(data) % RAW_SENSOR_DTYPE.itemsize == 0
+
+    response = upload(client, data, content_type)
+    assert response.status_code == 200
+    result = wait_for_analysis(client, response.json()['session_id'])
+
+    expected = upload(client, data, 'text/csv')
+    assert result['laps'] == wait_for_analysis(client, expected.json()['session_id'])['laps']
+
+
+def test_upload_raw(client):
+    """専用のContent-TypeでRAWバイナリとして解析されること"""
+    response = upload(client, make_raw(), RAW_CONTENT_TYPE)
+    assert response.status_code == 200
+    result = wait_for_analysis(client, response.json()['session_id'])
+    assert result['pool_length_m'] == 25
+
+
+def test_upload_raw_invalid_size(client):
+    """レコード長の倍数でないRAWデータは400になること"""
+    response = upload(client, make_raw()[:-1], RAW_CONTENT_TYPE)
+    assert response.status_code == 400
+    assert "20-byte record size" in response.json()['detail']
+
+
+def test_upload_missing_columns(client):
+    """必須列が欠けたCSVは400になること"""
+    response = upload(client, b'a,b\n1,2\n')
+    assert response.status_code == 400
+    assert response.json()['detail'].startswith("Missing required columns")
+
+
+def test_upload_removes_cache_after_analysis(client, cache_dir):
+    """解析完了後にアップロードキャッシュが削除されること"""
+    data, _ = make_csv(n_samples=600)
+
+    response = upload(client, data)
+    assert response.status_code == 200
+    session_id = response.json()['session_id']
+
+    # TestClientではバックグラウンド解析はレスポンス後に同期実行される
+    status = client.get(f'/api/v1/sessions/{session_id}/status').json()
+    assert status['status'] == 'completed'
+    assert list(cache_dir.iterdir()) == []
+
+
+def test_failed_analysis_removes_cache(client, cache_dir, monkeypatch):
+    """解析が失敗してもアップロードキャッシュが削除されること"""
+    from app.api.v1 import sessions
+
+    def failing_executor():
+        raise RuntimeError("worker pool unavailable")
+
+    monkeypatch.setattr(sessions, 'get_executor', failing_executor)
+
+    response = upload(client, make_csv(n_samples=600)[0])
+    session_id = response.json()['session_id']
+
+    status = client.get(f'/api/v1/sessions/{session_id}/status').json()
+    assert status['status'] == 'failed'
+    assert status['error_message'] == "worker pool unavailable"
+    assert list(cache_dir.iterdir()) == []
+
+
+def test_purge_session_cache(cache_dir):
+    """古いキャッシュファイルだけが起動時に削除されること"""
+    import os
+    from app.tasks import purge_session_cache
+
+    stale = cache_dir / "stale.feather"
+    fresh = cache_dir / "fresh.feather"
+    stale.write_bytes(b"")
+    fresh.write_bytes(b"")
+    os.utime(stale, (0, 0))
+
+    assert purge_session_cache(max_age_sec=3600) == 1
+    assert list(cache_dir.iterdir()) == [fresh]
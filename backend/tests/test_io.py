@@ -0,0 +1,186 @@
+"""
+AquaMetric Sensor I/O Tests
+CSV / RAWバイナリの読み込み、セッションキャッシュ、Arrow IPC出力のテスト
+
+使用方法:
+    cd aquametric/backend
+    python -m pytest tests/test_io.py
+"""
+import sys
+from pathlib import Path
+
+# プロジェクトルートをパスに追加
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+import numpy as np
+import pytest
+
+from app.core import io as sensor_io
+from app.core.io import (
+    ACC_COLUMNS,
+    ACC_SCALE,
+    GYRO_COLUMNS,
+    GYRO_SCALE,
+    MAG_COLUMNS,
+    RAW_SENSOR_DTYPE,
+    MissingColumnsError,
+    InvalidRawDataError,
+    laps_to_arrow_ipc,
+    load_sensor_csv,
+    load_sensor_raw,
+    read_sensor_cache,
+    write_sensor_cache,
+)
+
+
+def make_csv(n_samples: int = 50, columns=None, seed: int = 0) -> tuple[bytes, dict]:
+    """
+    SwimBIT形式の模擬CSVを生成
+
+    Returns:
+        (CSVバイト列, 列名→値の辞書)
+    """
+    if columns is None:
+        columns = ('timestamp',) + ACC_COLUMNS + GYRO_COLUMNS + MAG_COLUMNS
+    rng = np.random.default_rng(seed)
+    values = {
+        name: (np.arange(n_samples) * 0.25 if name == 'timestamp'
+               else rng.normal(size=n_samples).round(4))
+        for name in columns
+    }
+    lines = [','.join(columns)]
+    lines += [','.join(repr(float(values[name][i])) for name in columns)
+              for i in range(n_samples)]
+    return ('\n'.join(lines) + '\n').encode(), values
+
+
+@pytest.fixture(params=['arrow', 'pandas'])
+def csv_backend(request, monkeypatch):
+    """pyarrowパーサとpandasフォールバックの両方でテスト"""
+    if request.param == 'arrow':
+        if not sensor_io.ARROW_AVAILABLE:
+            pytest.skip("pyarrow not installed")
+    else:
+        monkeypatch.setattr(sensor_io, 'pacsv', None)
+    return request.param
+
+
+def test_load_sensor_csv(csv_backend):
+    """CSVが列ごとにfloat32 (N, 3) 配列として読み込まれること"""
+    data, values = make_csv()
+    timestamps, accel, gyro, mag = load_sensor_csv(data)
+
+    assert timestamps.dtype == np.float64
+    np.testing.assert_array_equal(timestamps, values['timestamp'])
+    for array, names in ((accel, ACC_COLUMNS), (gyro, GYRO_COLUMNS), (mag, MAG_COLUMNS)):
+        assert array.dtype == np.float32
+        assert array.shape == (50, 3)
+        assert array.flags.f_contiguous
+        expected = np.column_stack([values[name] for name in names]).astype(np.float32)
+        np.testing.assert_array_equal(array, expected)
+
+
+def test_load_sensor_csv_optional_columns(csv_backend):
+    """任意列(MAG, timestamp)が無い場合の扱い"""
+    data, _ = make_csv(columns=ACC_COLUMNS + GYRO_COLUMNS)
+    timestamps, accel, gyro, mag = load_sensor_csv(data, required=ACC_COLUMNS)
+
+    np.testing.assert_array_equal(timestamps, np.arange(50))
+    assert gyro is not None
+    assert mag is None
+
+
+def test_load_sensor_csv_missing_columns(csv_backend):
+    """必須列が欠けたCSVでMissingColumnsErrorになること"""
+    data, _ = make_csv(columns=('timestamp', 'ACC_0', 'ACC_2', 'GYRO_0'))
+
+    with pytest.raises(MissingColumnsError) as excinfo:
+        load_sensor_csv(data)
+
+    # 欠損列はSwimBIT形式の列順で報告される
+    assert excinfo.value.missing == ['ACC_1', 'GYRO_1', 'GYRO_2']
+    assert str(excinfo.value) == "Missing required columns: ['ACC_1', 'GYRO_1', 'GYRO_2']"
+
+
+def test_load_sensor_raw():
+    """RAWレコードがACC_SCALE / GYRO_SCALEで物理量に変換されること"""
+    records = np.zeros(4, dtype=RAW_SENSOR_DTYPE)
+    records['t'] = [0, 33_333_333, 66_666_667, 100_000_000]
+    records['ax'], records['ay'], records['az'] = [1, -1, 32767, -32768], [2, 0, 0, 0], [0, 0, 0, 2048]
+    records['gx'], records['gy'], records['gz'] = [0, 0, 0, 0], [16, 0, -16, 0], [0, 100, 0, 0]
+
+    timestamps, accel, gyro, mag = load_sensor_raw(records.tobytes())
+
+    assert mag is None
+    np.testing.assert_array_equal(timestamps, records['t'].astype(np.float64))
+    for array, names, scale in ((accel, ('ax', 'ay', 'az'), ACC_SCALE),
+                                (gyro, ('gx', 'gy', 'gz'), GYRO_SCALE)):
+        assert array.dtype == np.float32
+        assert array.flags.f_contiguous
+        expected = np.column_stack([records[name] for name in names]) * scale
+        np.testing.assert_allclose(array, expected, rtol=1e-6)
+    # 2048 LSB = 1 g (±16 g フルスケール)
+    assert accel[3, 2] == pytest.approx(9.80665)
+
+
+def test_load_sensor_raw_invalid_size():
+    """レコード長の倍数でないRAWデータを拒否すること"""
+    data = np.zeros(2, dtype=RAW_SENSOR_DTYPE).tobytes()[:-1]
+
+    with pytest.raises(InvalidRawDataError) as excinfo:
+        load_sensor_raw(data)
+    assert excinfo.value.size == len(data)
+
+
+@pytest.mark.parametrize('suffix', ['.feather', '.npz'])
+def test_sensor_cache_roundtrip(tmp_path, suffix):
+    """Feather / .npz キャッシュが同じデータを往復すること"""
+    if suffix == '.feather' and not sensor_io.ARROW_AVAILABLE:
+        pytest.skip("pyarrow not installed")
+
+    timestamps, accel, gyro, mag = load_sensor_csv(make_csv()[0])
+    path = tmp_path / f"session{suffix}"
+    write_sensor_cache(path, timestamps, accel, gyro, mag)
+
+    cached = read_sensor_cache(path)
+    for original, restored in zip((timestamps, accel, gyro, mag), cached):
+        assert restored.dtype == original.dtype
+        np.testing.assert_array_equal(restored, original)
+
+
+def test_sensor_cache_without_optional_arrays(tmp_path):
+    """gyro / mag 無しでもキャッシュできること"""
+    timestamps, accel, _, _ = load_sensor_csv(make_csv()[0])
+    path = tmp_path / f"session{sensor_io.SENSOR_CACHE_SUFFIX}"
+    write_sensor_cache(path, timestamps, accel)
+
+    _, restored, gyro, mag = read_sensor_cache(path)
+    np.testing.assert_array_equal(restored, accel)
+    assert gyro is None and mag is None
+
+
+def test_laps_to_arrow_ipc():
+    """Arrow IPCストリームをデコードしてラップ情報が復元できること"""
+    pa = pytest.importorskip('pyarrow')
+    from app.models import SwimLap
+    from app.schemas import StrokeType
+
+    laps = [
+        SwimLap(lap_number=1, start_idx=0, end_idx=600, stroke_type=StrokeType.FREESTYLE,
+                stroke_count=18, duration_sec=20.0),
+        SwimLap(lap_number=2, start_idx=660, end_idx=1350, stroke_type=StrokeType.BREASTSTROKE,
+                stroke_count=12, duration_sec=23.0),
+    ]
+
+    table = pa.ipc.open_stream(laps_to_arrow_ipc(laps, sampling_rate=30.0)).read_all()
+
+    assert table.num_rows == 2
+    columns = table.to_pydict()
+    assert columns['lap_number'] == [1, 2]
+    assert columns['stroke_type'] == ['freestyle', 'breaststroke']
+    assert columns['stroke_count'] == [18, 12]
+    assert columns['swolf'] == [lap.swolf for lap in laps]
+    assert columns['pace_per_100m'] == [lap.pace_per_100m for lap in laps]
+    assert columns['start_time'] == [0.0, 22.0]
+    assert columns['end_time'] == [20.0, 45.0]
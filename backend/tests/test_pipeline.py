@@ -24,11 +24,18 @@ def load_swimbit_data(csv_path: str) -> tuple:
     Returns:
         (timestamps, accel, gyro, labels)
     """
-    df = pd.read_csv(csv_path)
+    from app.core.io import ARROW_AVAILABLE, SENSOR_DTYPES
     
-    timestamps = df['timestamp'].values
-    accel = df[['ACC_0', 'ACC_1', 'ACC_2']].values.astype(np.float32)
-    gyro = df[['GYRO_0', 'GYRO_1', 'GYRO_2']].values.astype(np.float32)
+    # センサ列はパース時にfloat32として読み込む(pyarrowがあれば使用)
+    df = pd.read_csv(
+        csv_path,
+        dtype=SENSOR_DTYPES,
+        engine='pyarrow' if ARROW_AVAILABLE else 'c'
+    )
+    
+    timestamps = df['timestamp'].to_numpy()
+    accel = df[['ACC_0', 'ACC_1', 'ACC_2']].to_numpy()
+    gyro = df[['GYRO_0', 'GYRO_1', 'GYRO_2']].to_numpy()
     
     labels = None
     if 'label' in df.columns:
@@ -117,6 +124,58 @@ def test_classifier():
     print("✅ Classifier test passed")
 
 
+def test_classifier_batch():
+    """一括分類と逐次分類の一致テスト"""
+    print("\n=== Energy Classifier Batch Test ===")
+    
+    from app.core.classifier import EnergyClassifier
+    
+    classifier = EnergyClassifier()
+    
+    # 泳法の異なるラップを連結した模擬セッション
+    np.random.seed(42)
+    scales = [(5, 15, 5), (20, 5, 18), (8, 5, 10), (10, 10, 10)]
+    accel = np.vstack([
+        np.random.randn(300, 3) * scale for scale in scales
+    ]).astype(np.float32)
+    bounds = [(0, 300), (300, 600), (600, 900), (900, 1200), (1200, 1210)]
+    
+    batch = classifier.classify_batch(accel, bounds)
+    single = [classifier.classify(accel[start:end]) for start, end in bounds]
+    
+    print(f"Batch → {[stroke.value for stroke in batch]}")
+    assert batch == single
+    
+    # 平均・エネルギーが閾値ちょうどになるラップ(±振幅の交互信号)
+    # (X振幅, Y振幅, Z振幅, Z平均) → E_x, E_y, E_z と重力Z平均
+    alternating = np.tile([1.0, -1.0], 150)
+    threshold_laps = [
+        (0, 0, 1, 5.0),      # Z平均 = backstroke_gravity_z
+        (15, 0, 10, 0.0),    # E_x = butterfly_x_energy
+        (12, 11.5, 12, 0.0), # E_x = breaststroke_energy_max, 合計 > 35
+        (12, 10, 12, 0.0),   # E_x = breaststroke_energy_max, 合計 < 35
+        (5, 6, 5, 0.0),      # E_y = E_x * freestyle_y_energy_ratio
+    ]
+    laps = [
+        np.column_stack([alternating * ax, alternating * ay, alternating * az + z_mean])
+        for ax, ay, az, z_mean in threshold_laps
+    ]
+    
+    # Z平均が閾値近傍のfloat32ラップ(累積精度の差で判定が割れやすい)
+    for scale in np.random.uniform(0, 20, size=(20, 3)):
+        lap = np.random.randn(300, 3) * scale
+        lap[:, 2] += 5.0 - lap[:, 2].mean()
+        laps.append(lap)
+    
+    accel = np.vstack(laps).astype(np.float32)
+    bounds = [(i * 300, (i + 1) * 300) for i in range(len(laps))]
+    
+    batch = classifier.classify_batch(accel, bounds)
+    single = [classifier.classify(accel[start:end]) for start, end in bounds]
+    assert batch == single
+    print("✅ Classifier batch test passed")
+
+
 def test_pipeline_with_swimbit_data(data_path: str):
     """
     実際のSwimBITデータでパイプラインをテスト
@@ -199,6 +258,7 @@ def main():
     # 基本コンポーネントテスト
     test_filter()
     test_classifier()
+    test_classifier_batch()
     
     # 実データでのテスト
     sample_files = find_sample_data_files()
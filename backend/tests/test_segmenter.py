@@ -0,0 +1,110 @@
+"""
+AquaMetric Segmenter Tests
+ラン(連続区間)上のモルフォロジー演算のテスト
+
+使用方法:
+    cd aquametric/backend
+    python -m pytest tests/test_segmenter.py
+"""
+import sys
+from pathlib import Path
+
+# プロジェクトルートをパスに追加
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+import numpy as np
+import pytest
+
+from app.core.segmenter import _close_runs, _mask_runs, _open_runs
+
+
+SIZE = 2  # 構造要素の半幅(窓幅 2 * SIZE + 1)
+
+
+def reference_close(mask: np.ndarray, size: int) -> np.ndarray:
+    """サンプル単位の膨張→収縮(端の外側は無視)"""
+    n = len(mask)
+    dilated = np.array([mask[max(0, i - size):i + size + 1].any() for i in range(n)], dtype=bool)
+    return np.array([dilated[max(0, i - size):i + size + 1].all() for i in range(n)], dtype=bool)
+
+
+def reference_open(mask: np.ndarray, size: int) -> np.ndarray:
+    """サンプル単位の収縮→膨張(端の外側は無視)"""
+    n = len(mask)
+    eroded = np.array([mask[max(0, i - size):i + size + 1].all() for i in range(n)], dtype=bool)
+    return np.array([eroded[max(0, i - size):i + size + 1].any() for i in range(n)], dtype=bool)
+
+
+def runs(mask: np.ndarray) -> list[tuple[int, int]]:
+    starts, ends = _mask_runs(mask)
+    return list(zip(starts.tolist(), ends.tolist()))
+
+
+def close(mask: np.ndarray, size: int = SIZE) -> list[tuple[int, int]]:
+    starts, ends = _close_runs(*_mask_runs(mask), len(mask), size)
+    return list(zip(starts.tolist(), ends.tolist()))
+
+
+def open_(mask: np.ndarray, size: int = SIZE) -> list[tuple[int, int]]:
+    starts, ends = _open_runs(*_mask_runs(mask), len(mask), size)
+    return list(zip(starts.tolist(), ends.tolist()))
+
+
+def make_mask(n: int, *true_runs: tuple[int, int]) -> np.ndarray:
+    mask = np.zeros(n, dtype=bool)
+    for start, end in true_runs:
+        mask[start:end] = True
+    return mask
+
+
+# (マスク, 期待されるラン) — 端・境界ちょうどのケース
+CLOSE_CASES = {
+    'empty': (make_mask(0), []),
+    'all_false': (make_mask(10), []),
+    'all_true': (make_mask(10, (0, 10)), [(0, 10)]),
+    'gap_equal_2size': (make_mask(10, (0, 3), (7, 10)), [(0, 10)]),
+    'gap_over_2size': (make_mask(12, (0, 3), (8, 12)), [(0, 3), (8, 12)]),
+    'edge_gaps_equal_size': (make_mask(10, (2, 8)), [(0, 10)]),
+    'edge_gaps_over_size': (make_mask(10, (3, 7)), [(3, 7)]),
+    'touching_both_ends': (make_mask(20, (0, 5), (15, 20)), [(0, 5), (15, 20)]),
+}
+
+OPEN_CASES = {
+    'empty': (make_mask(0), []),
+    'all_false': (make_mask(10), []),
+    'all_true': (make_mask(10, (0, 10)), [(0, 10)]),
+    'short_run_spanning_data': (make_mask(3, (0, 3)), [(0, 3)]),
+    'interior_run_equal_2size': (make_mask(12, (4, 8)), []),
+    'interior_run_over_2size': (make_mask(12, (4, 9)), [(4, 9)]),
+    'start_run_equal_size': (make_mask(10, (0, 2)), []),
+    'start_run_over_size': (make_mask(10, (0, 3)), [(0, 3)]),
+    'end_run_equal_size': (make_mask(10, (8, 10)), []),
+    'end_run_over_size': (make_mask(10, (7, 10)), [(7, 10)]),
+    'touching_both_ends': (make_mask(20, (0, 2), (17, 20)), [(17, 20)]),
+}
+
+
+@pytest.mark.parametrize('mask, expected', CLOSE_CASES.values(), ids=CLOSE_CASES.keys())
+def test_close_runs_edge_cases(mask, expected):
+    """閉演算: 端・ギャップ長が境界ちょうどのケース"""
+    assert close(mask) == expected
+    assert close(mask) == runs(reference_close(mask, SIZE))
+
+
+@pytest.mark.parametrize('mask, expected', OPEN_CASES.values(), ids=OPEN_CASES.keys())
+def test_open_runs_edge_cases(mask, expected):
+    """開演算: 端・ラン長が境界ちょうどのケース"""
+    assert open_(mask) == expected
+    assert open_(mask) == runs(reference_open(mask, SIZE))
+
+
+def test_runs_match_reference_on_random_masks():
+    """ランダムなマスクでサンプル単位の実装と一致すること"""
+    rng = np.random.default_rng(0)
+    for _ in range(300):
+        n = int(rng.integers(0, 60))
+        size = int(rng.integers(1, 5))
+        mask = rng.random(n) < rng.uniform(0.2, 0.8)
+        assert close(mask, size) == runs(reference_close(mask, size))
+        assert open_(mask, size) == runs(reference_open(mask, size))
@@ -0,0 +1,135 @@
+"""
+AquaMetric Session Store Tests
+セッションストアのシリアライズとRedisバックエンドのテスト
+
+使用方法:
+    cd aquametric/backend
+    python -m pytest tests/test_store.py
+
+Redisの統合テストは AQUAMETRIC_TEST_REDIS_URL が設定されている場合のみ実行
+"""
+import asyncio
+import os
+import sys
+from datetime import datetime
+from pathlib import Path
+from uuid import uuid4
+
+# プロジェクトルートをパスに追加
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+import numpy as np
+import pytest
+
+from app.core import io as sensor_io
+from app.core.store import (
+    RedisSessionStore,
+    _decode_fields,
+    _decode_result,
+    _encode_fields,
+    _encode_result,
+)
+from app.models import AnalysisResult, SwimLap
+from app.schemas import SessionStatus, StrokeType
+
+
+def make_result() -> AnalysisResult:
+    """2ラップの模擬解析結果"""
+    return AnalysisResult(
+        session_id=uuid4(),
+        processed_at=datetime(2024, 1, 5, 7, 30, 15, 250000),
+        pool_length_m=25,
+        laps=[
+            SwimLap(lap_number=1, start_idx=0, end_idx=600, stroke_type=StrokeType.FREESTYLE,
+                    stroke_count=18, duration_sec=20.0),
+            SwimLap(lap_number=2, start_idx=660, end_idx=1350, stroke_type=StrokeType.BUTTERFLY,
+                    stroke_count=14, duration_sec=23.5),
+        ],
+        filtered_accel=np.zeros((1350, 3), dtype=np.float32),
+    ).finalize()
+
+
+def test_session_fields_roundtrip():
+    """セッションのメタデータがJSON経由で型ごと復元されること"""
+    session = {
+        "id": uuid4(),
+        "status": SessionStatus.PROCESSING,
+        "pool_length_m": 50,
+        "device_type": "watch",
+        "notes": None,
+        "uploaded_at": datetime(2024, 1, 5, 7, 30),
+        "progress": 10,
+    }
+
+    encoded = _encode_fields(session)
+    decoded = _decode_fields({name.encode(): value for name, value in encoded.items()})
+
+    assert decoded == session
+    assert isinstance(decoded["status"], SessionStatus)
+
+
+def test_session_fields_reject_unknown_types():
+    """JSONにできない値は保存を拒否すること"""
+    with pytest.raises(TypeError):
+        _encode_fields({"cache": object()})
+
+
+@pytest.mark.parametrize('encoding', ['arrow', 'json'])
+def test_result_roundtrip(monkeypatch, encoding):
+    """解析結果がラップ込みで復元され、フィルタ済み配列は保存されないこと"""
+    if encoding == 'arrow' and not sensor_io.ARROW_AVAILABLE:
+        pytest.skip("pyarrow not installed")
+    monkeypatch.setattr('app.core.store.LAPS_ENCODING', encoding)
+    if encoding == 'json':
+        monkeypatch.setattr(sensor_io, 'ARROW_AVAILABLE', False)
+
+    result = make_result()
+    encoded = _encode_result(result)
+    decoded = _decode_result({name.encode(): value for name, value in encoded.items()})
+
+    assert decoded.session_id == result.session_id
+    assert decoded.processed_at == result.processed_at
+    assert decoded.pool_length_m == result.pool_length_m
+    assert decoded.laps == result.laps
+    assert decoded.filtered_accel is None
+    assert decoded.avg_swolf == result.avg_swolf
+    assert decoded.get_stroke_breakdown() == result.get_stroke_breakdown()
+
+
+@pytest.fixture
+def redis_url():
+    url = os.environ.get("AQUAMETRIC_TEST_REDIS_URL")
+    if not url:
+        pytest.skip("AQUAMETRIC_TEST_REDIS_URL not set")
+    return url
+
+
+def test_redis_store(redis_url):
+    """Redisストアの保存・更新・期限切れ後の更新"""
+    async def scenario():
+        store = RedisSessionStore(redis_url, ttl_sec=60)
+        session_id = uuid4()
+        key = store._session_key(session_id)
+        try:
+            await store.set_session(session_id, {"id": session_id, "progress": 0})
+            await store.update_session(session_id, progress=50, status=SessionStatus.COMPLETED)
+
+            session = await store.get_session(session_id)
+            assert session == {"id": session_id, "progress": 50,
+                               "status": SessionStatus.COMPLETED}
+            assert 0 < await store._redis.ttl(key) <= 60
+
+            result = make_result()
+            await store.set_result(session_id, result)
+            assert (await store.get_result(session_id)).laps == result.laps
+
+            # 期限切れ(削除)後の更新でキーが再作成されないこと
+            await store._redis.delete(key)
+            await store.update_session(session_id, progress=90)
+            assert not await store._redis.exists(key)
+        finally:
+            await store.delete_session(session_id)
+            await store.close()
+
+    asyncio.run(scenario())
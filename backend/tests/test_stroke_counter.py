@@ -0,0 +1,58 @@
+"""
+AquaMetric Stroke Counter Tests
+FFTバックエンドによらずストローク数が一致することのテスト
+
+使用方法:
+    cd aquametric/backend
+    python -m pytest tests/test_stroke_counter.py
+"""
+import sys
+from pathlib import Path
+
+# プロジェクトルートをパスに追加
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+import numpy as np
+import pytest
+
+from app.core import stroke_counter
+from app.core.stroke_counter import BasicStrokeCounter
+from app.schemas import StrokeType
+
+
+def make_laps(n_laps: int = 40, seed: int = 0) -> list[np.ndarray]:
+    """ストローク周期の正弦波にノイズを加えた模擬ラップ (float32, 列優先)"""
+    rng = np.random.default_rng(seed)
+    laps = []
+    for _ in range(n_laps):
+        n = int(rng.integers(30, 1500))
+        t = np.arange(n) / 30.0
+        freq = rng.uniform(0.3, 1.5)
+        signal = np.sin(2 * np.pi * freq * t)[:, None] * rng.uniform(1, 10, 3)
+        lap = signal + rng.normal(size=(n, 3)) * rng.uniform(0.1, 3)
+        laps.append(np.asfortranarray(lap, dtype=np.float32))
+    return laps
+
+
+def count_all(counter: BasicStrokeCounter, laps: list[np.ndarray]) -> list[int]:
+    return [counter.count_strokes_fft(lap, stroke) for lap in laps for stroke in StrokeType]
+
+
+@pytest.mark.parametrize('backend', ['numpy', 'pyfftw'])
+def test_fft_backends_agree(monkeypatch, backend):
+    """pyfftw / NumPy のFFTでscipy.fftと同じストローク数になること"""
+    laps = make_laps()
+    counter = BasicStrokeCounter(sampling_rate=30.0)
+    expected = count_all(counter, laps)
+
+    if backend == 'pyfftw':
+        pytest.importorskip('pyfftw')
+        stroke_counter._get_rfft.cache_clear()
+        rfft = stroke_counter._get_rfft()
+        assert rfft is not stroke_counter.sfft.rfft
+    else:
+        rfft = np.fft.rfft
+    monkeypatch.setattr(stroke_counter, '_get_rfft', lambda: rfft)
+
+    assert count_all(counter, laps) == expected